@@ -1,95 +1,96 @@
 import os
 import sqlite3
+import threading
 from flask import g
 
+from .migrations import migrate
+from .profiling import instrument
+
 BASE_DIR = os.path.dirname(__file__)
 INSTANCE_DIR = os.path.join(BASE_DIR, "instance")
 DB_PATH = os.path.join(INSTANCE_DIR, "app.db")
 
+# 연결마다 적용하는 PRAGMA (journal_mode=WAL 은 DB 파일에 유지됨)
+DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-16000",      # 약 16MB
+    "PRAGMA mmap_size=134217728",    # 128MB
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",
+)
+
+# 워커 스레드마다 연결 하나를 재사용
+_local = threading.local()
+
+
+def connect(path=None):
+    """튜닝된 PRAGMA 가 적용된 새 연결"""
+    path = path or DB_PATH
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, timeout=5)
+    conn.row_factory = sqlite3.Row
+    for pragma in DB_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def _is_healthy(conn):
+    try:
+        conn.execute("SELECT 1").fetchone()
+        return True
+    except sqlite3.Error:
+        return False
+
+
+def get_thread_db():
+    """
+    현재 스레드의 연결을 꺼낸다 (요청 밖의 백그라운드 작업에서도 사용 가능).
+    끊긴 연결이나 DB_PATH 가 바뀐 연결은 새로 연다.
+
+    연결(과 PRAGMA 적용)이 재사용되는 것은 오래 사는 스레드뿐이다 (gunicorn 워커의 요청 스레드,
+    결과 writer 스레드 등). 요청마다 스레드를 만드는 서버나 작업이 끝나면 사라지는 풀 워커는
+    매번 새로 연결하므로, 그런 스레드는 끝날 때 release_thread_db() 로 닫는다.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is not None and (_local.path != DB_PATH or not _is_healthy(conn)):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        conn = None
+    if conn is None:
+        conn = connect(DB_PATH)
+        _local.conn = conn
+        _local.path = DB_PATH
+    return conn
+
+
+def release_thread_db():
+    """현재 스레드의 연결을 닫는다 (풀 워커/백그라운드 스레드가 작업을 마칠 때 호출)"""
+    conn = getattr(_local, "conn", None)
+    _local.conn = None
+    _local.path = None
+    if conn is not None:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
 
 def get_db():
     if "db" not in g:
-        os.makedirs(INSTANCE_DIR, exist_ok=True)
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        g.db = conn
+        g.db = instrument(get_thread_db())
     return g.db
 
 
 def close_db(_error=None):
+    # 연결은 스레드에 남겨 재사용하고, 커밋되지 않은 트랜잭션만 정리
     db = g.pop("db", None)
-    if db is not None:
-        db.close()
+    if db is not None and db.in_transaction:
+        db.rollback()
 
 
 def init_db():
-    db = get_db()
-    schema = """
-    CREATE TABLE IF NOT EXISTS users (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        nickname TEXT UNIQUE NOT NULL,
-        created_at TEXT NOT NULL
-    );
-
-    CREATE TABLE IF NOT EXISTS questions (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        topic TEXT NOT NULL,
-        question TEXT NOT NULL,
-        choice_a TEXT NOT NULL,
-        choice_b TEXT NOT NULL,
-        choice_c TEXT NOT NULL,
-        choice_d TEXT NOT NULL,
-        correct TEXT NOT NULL,
-        concept_tag TEXT NOT NULL,
-        difficulty TEXT NOT NULL DEFAULT 'medium'
-    );
-
-    CREATE TABLE IF NOT EXISTS attempts (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id INTEGER NOT NULL,
-        score INTEGER NOT NULL,
-        weak_tags TEXT NOT NULL,
-        duration_seconds INTEGER NOT NULL DEFAULT 0,
-        created_at TEXT NOT NULL,
-        FOREIGN KEY(user_id) REFERENCES users(id)
-    );
-
-    CREATE TABLE IF NOT EXISTS hall_of_fame (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        nickname TEXT UNIQUE NOT NULL,
-        best_score INTEGER NOT NULL,
-        best_duration_seconds INTEGER NOT NULL DEFAULT 0,
-        updated_at TEXT NOT NULL,
-        difficulty TEXT NOT NULL DEFAULT ''
-    );
-
-    CREATE TABLE IF NOT EXISTS concept_videos (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        concept_tag TEXT NOT NULL,
-        youtube_url TEXT NOT NULL
-    );
-
-    CREATE TABLE IF NOT EXISTS schedules (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        title TEXT NOT NULL,
-        start_date TEXT NOT NULL,
-        end_date TEXT NOT NULL,
-        note TEXT,
-        include_weekends INTEGER NOT NULL DEFAULT 0,
-        created_at TEXT NOT NULL
-    );
-    """
-    db.executescript(schema)
-    # Add missing columns if needed (for existing DBs)
-    cols = [row["name"] for row in db.execute("PRAGMA table_info(hall_of_fame)").fetchall()]
-    if "difficulty" not in cols:
-        db.execute("ALTER TABLE hall_of_fame ADD COLUMN difficulty TEXT NOT NULL DEFAULT ''")
-    if "best_duration_seconds" not in cols:
-        db.execute("ALTER TABLE hall_of_fame ADD COLUMN best_duration_seconds INTEGER NOT NULL DEFAULT 0")
-    cols = [row["name"] for row in db.execute("PRAGMA table_info(attempts)").fetchall()]
-    if "duration_seconds" not in cols:
-        db.execute("ALTER TABLE attempts ADD COLUMN duration_seconds INTEGER NOT NULL DEFAULT 0")
-    cols = [row["name"] for row in db.execute("PRAGMA table_info(schedules)").fetchall()]
-    if "include_weekends" not in cols:
-        db.execute("ALTER TABLE schedules ADD COLUMN include_weekends INTEGER NOT NULL DEFAULT 0")
-    db.commit()
+    """스키마를 최신 버전으로 올린다 (app/migrations 참고)"""
+    return migrate(get_db())
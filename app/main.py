@@ -1,5 +1,6 @@
 from flask import Flask
 from .db import init_db, close_db
+from . import profiling, sessions
 from .routes.quiz import quiz_bp
 from .routes.hall import hall_bp
 from .routes.landing import landing_bp
@@ -15,6 +16,8 @@ def create_app():
         init_db()
 
     app.teardown_appcontext(close_db)
+    profiling.init_app(app)
+    sessions.init_app(app)
     app.register_blueprint(landing_bp)
     app.register_blueprint(quiz_bp, url_prefix="/quiz")
     app.register_blueprint(hall_bp, url_prefix="/hall")
@@ -23,8 +26,14 @@ def create_app():
     return app
 
 
-app = create_app()
+def __getattr__(name):
+    # `app.main:app` (gunicorn 등) 으로 처음 접근할 때 앱을 만든다.
+    # import 만 해서는 create_app() 이 돌지 않으므로 스크립트가 DB_PATH 를 바꾼 뒤 앱을 만들 수 있다.
+    if name == "app":
+        globals()["app"] = create_app()
+        return globals()["app"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    create_app().run(debug=True)
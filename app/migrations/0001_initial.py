@@ -0,0 +1,98 @@
+"""
+초기 스키마. user_version 도입 이전의 DB(테이블은 있지만 user_version=0)도
+그대로 올라오도록 CREATE IF NOT EXISTS 와 누락 컬럼 보정을 함께 한다.
+"""
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nickname TEXT UNIQUE NOT NULL,
+        created_at TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS questions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        topic TEXT NOT NULL,
+        question TEXT NOT NULL,
+        choice_a TEXT NOT NULL,
+        choice_b TEXT NOT NULL,
+        choice_c TEXT NOT NULL,
+        choice_d TEXT NOT NULL,
+        correct TEXT NOT NULL,
+        concept_tag TEXT NOT NULL,
+        difficulty TEXT NOT NULL DEFAULT 'medium'
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS attempts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        score INTEGER NOT NULL,
+        weak_tags TEXT NOT NULL,
+        duration_seconds INTEGER NOT NULL DEFAULT 0,
+        created_at TEXT NOT NULL,
+        FOREIGN KEY(user_id) REFERENCES users(id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS hall_of_fame (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nickname TEXT UNIQUE NOT NULL,
+        best_score INTEGER NOT NULL,
+        best_duration_seconds INTEGER NOT NULL DEFAULT 0,
+        updated_at TEXT NOT NULL,
+        difficulty TEXT NOT NULL DEFAULT ''
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS concept_videos (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        concept_tag TEXT NOT NULL,
+        youtube_url TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS schedules (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        start_date TEXT NOT NULL,
+        end_date TEXT NOT NULL,
+        note TEXT,
+        include_weekends INTEGER NOT NULL DEFAULT 0,
+        created_at TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS news_llm_cache (
+        source TEXT NOT NULL,
+        story_id TEXT NOT NULL,
+        title_hash TEXT NOT NULL,
+        prompt_version INTEGER NOT NULL,
+        content TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        PRIMARY KEY (source, story_id, title_hash, prompt_version)
+    )
+    """,
+]
+
+
+def _columns(db, table):
+    return [row[1] for row in db.execute(f"PRAGMA table_info({table})").fetchall()]
+
+
+def upgrade(db):
+    # executescript 는 트랜잭션을 커밋해 버리므로 문장 단위로 실행
+    for statement in SCHEMA:
+        db.execute(statement)
+    # Add missing columns if needed (for existing DBs)
+    cols = _columns(db, "hall_of_fame")
+    if "difficulty" not in cols:
+        db.execute("ALTER TABLE hall_of_fame ADD COLUMN difficulty TEXT NOT NULL DEFAULT ''")
+    if "best_duration_seconds" not in cols:
+        db.execute("ALTER TABLE hall_of_fame ADD COLUMN best_duration_seconds INTEGER NOT NULL DEFAULT 0")
+    if "duration_seconds" not in _columns(db, "attempts"):
+        db.execute("ALTER TABLE attempts ADD COLUMN duration_seconds INTEGER NOT NULL DEFAULT 0")
+    if "include_weekends" not in _columns(db, "schedules"):
+        db.execute("ALTER TABLE schedules ADD COLUMN include_weekends INTEGER NOT NULL DEFAULT 0")
@@ -0,0 +1,29 @@
+"""
+라우트 조회 경로용 인덱스. 조회 컬럼까지 넣어 테이블을 다시 읽지 않도록(covering) 했다.
+scripts/check_query_plans.py 가 이 인덱스를 타는지 확인한다.
+"""
+
+INDEXES = [
+    # 명예의 전당: 난이도별 TOP 20 (hall.fetch_rows)
+    """
+    CREATE INDEX IF NOT EXISTS idx_hall_of_fame_difficulty_rank
+    ON hall_of_fame (difficulty, best_score DESC, best_duration_seconds ASC, updated_at DESC, nickname)
+    """,
+    # 랜딩 TOP 5 (난이도 무관)
+    """
+    CREATE INDEX IF NOT EXISTS idx_hall_of_fame_rank
+    ON hall_of_fame (best_score DESC, best_duration_seconds ASC, updated_at DESC, nickname, difficulty)
+    """,
+    # 퀴즈 시작: difficulty 단독 / difficulty + topic 모두 이 인덱스로 처리
+    "CREATE INDEX IF NOT EXISTS idx_questions_difficulty_topic ON questions (difficulty, topic)",
+    # 주제 목록 (SELECT DISTINCT topic ... ORDER BY topic)
+    "CREATE INDEX IF NOT EXISTS idx_questions_topic ON questions (topic)",
+    "CREATE INDEX IF NOT EXISTS idx_concept_videos_tag ON concept_videos (concept_tag, youtube_url)",
+    # 기간 겹침 조회 (start_date <= ? AND end_date >= ?) 와 start_date 정렬
+    "CREATE INDEX IF NOT EXISTS idx_schedules_start_end ON schedules (start_date, end_date)",
+]
+
+
+def upgrade(db):
+    for statement in INDEXES:
+        db.execute(statement)
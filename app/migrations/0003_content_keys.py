@@ -0,0 +1,71 @@
+"""
+시드 데이터를 다시 적재해도 중복되지 않도록 questions, concept_videos 에 content_key(안정 식별자)와
+content_hash(내용 해시)를 추가한다.
+
+키/해시 계산은 이 마이그레이션을 만든 시점의 app.services.seeding 을 그대로 옮겨 둔 것이다.
+마이그레이션 결과가 나중의 seeding 변경에 따라 달라지지 않도록 import 하지 않는다
+(seeding 의 키 규칙을 바꾸면 새 마이그레이션으로 다시 채울 것).
+"""
+import hashlib
+
+QUESTION_FIELDS = (
+    "topic",
+    "question",
+    "choice_a",
+    "choice_b",
+    "choice_c",
+    "choice_d",
+    "correct",
+    "concept_tag",
+    "difficulty",
+)
+VIDEO_FIELDS = ("concept_tag", "youtube_url")
+
+
+def _digest(parts):
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def question_key(record):
+    if record.get("key"):
+        return str(record["key"])
+    return _digest((record["topic"].strip(), " ".join(record["question"].split())))
+
+
+def video_key(record):
+    if record.get("key"):
+        return str(record["key"])
+    return _digest((record["concept_tag"].strip(), record["youtube_url"].strip()))
+
+
+def content_hash(values):
+    return _digest([str(value) for value in values])
+
+
+def _backfill(db, table, fields, key_func):
+    seen = set()
+    rows = db.execute(f"SELECT id, {', '.join(fields)} FROM {table}").fetchall()
+    updates = []
+    for row in rows:
+        record = {field: row[field] for field in fields}
+        values = tuple(record[field] for field in fields)
+        key = key_func(record)
+        # 이미 중복 저장된 행은 키를 비워 둔다 (UNIQUE 인덱스는 NULL 을 허용)
+        if key in seen:
+            key = None
+        seen.add(key)
+        updates.append((key, content_hash(values), row["id"]))
+    db.executemany(f"UPDATE {table} SET content_key = ?, content_hash = ? WHERE id = ?", updates)
+
+
+def upgrade(db):
+    for table in ("questions", "concept_videos"):
+        cols = [row[1] for row in db.execute(f"PRAGMA table_info({table})").fetchall()]
+        if "content_key" not in cols:
+            db.execute(f"ALTER TABLE {table} ADD COLUMN content_key TEXT")
+        if "content_hash" not in cols:
+            db.execute(f"ALTER TABLE {table} ADD COLUMN content_hash TEXT")
+    _backfill(db, "questions", QUESTION_FIELDS, question_key)
+    _backfill(db, "concept_videos", VIDEO_FIELDS, video_key)
+    db.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_questions_content_key ON questions (content_key)")
+    db.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_concept_videos_content_key ON concept_videos (content_key)")
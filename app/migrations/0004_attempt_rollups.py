@@ -0,0 +1,64 @@
+"""
+attempts 일별 집계 테이블과 보관(archive) 테이블.
+
+- attempts.difficulty: 집계를 난이도별로 나누기 위해 추가 (기존 행은 '')
+- attempt_daily_stats / attempt_score_histogram / attempt_tag_misses: 일 x 난이도 단위 집계
+- attempts_archive: 집계가 끝난 오래된 attempts 를 옮겨 두는 곳
+- meta: 집계 워터마크 같은 작은 키-값 상태
+"""
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS attempt_daily_stats (
+        day TEXT NOT NULL,
+        difficulty TEXT NOT NULL,
+        attempts INTEGER NOT NULL,
+        score_sum INTEGER NOT NULL,
+        duration_sum INTEGER NOT NULL,
+        PRIMARY KEY (day, difficulty)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS attempt_score_histogram (
+        day TEXT NOT NULL,
+        difficulty TEXT NOT NULL,
+        score INTEGER NOT NULL,
+        attempts INTEGER NOT NULL,
+        PRIMARY KEY (day, difficulty, score)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS attempt_tag_misses (
+        day TEXT NOT NULL,
+        difficulty TEXT NOT NULL,
+        concept_tag TEXT NOT NULL,
+        misses INTEGER NOT NULL,
+        PRIMARY KEY (day, difficulty, concept_tag)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS attempts_archive (
+        id INTEGER PRIMARY KEY,
+        user_id INTEGER NOT NULL,
+        score INTEGER NOT NULL,
+        weak_tags TEXT NOT NULL,
+        duration_seconds INTEGER NOT NULL,
+        difficulty TEXT NOT NULL,
+        created_at TEXT NOT NULL
+    )
+    """,
+]
+
+
+def upgrade(db):
+    cols = [row[1] for row in db.execute("PRAGMA table_info(attempts)").fetchall()]
+    if "difficulty" not in cols:
+        db.execute("ALTER TABLE attempts ADD COLUMN difficulty TEXT NOT NULL DEFAULT ''")
+    for statement in SCHEMA:
+        db.execute(statement)
@@ -0,0 +1,17 @@
+"""
+서버 측 세션 저장소 (app/sessions.py, SESSION_BACKEND=sqlite).
+쿠키에는 id 만 싣고 퀴즈 진행 상태는 이 테이블에 둔다.
+"""
+
+
+def upgrade(db):
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS sessions (
+            id TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        ) WITHOUT ROWID
+        """
+    )
+    db.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions (expires_at)")
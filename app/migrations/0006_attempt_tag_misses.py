@@ -0,0 +1,12 @@
+"""
+attempts.tag_misses: 응시 한 번에서 개념 태그별로 틀린 문제 수 ({"태그": 횟수} JSON).
+
+weak_tags 는 화면에 보여 줄 상위 3개 태그뿐이라 태그별 오답 수 집계(attempt_tag_misses)의 원본이 될 수 없다.
+이 컬럼이 생기기 전의 행은 NULL 로 남고, 집계는 그런 행만 weak_tags 의 태그마다 1로 센다.
+"""
+
+
+def upgrade(db):
+    cols = [row[1] for row in db.execute("PRAGMA table_info(attempts)").fetchall()]
+    if "tag_misses" not in cols:
+        db.execute("ALTER TABLE attempts ADD COLUMN tag_misses TEXT")
@@ -0,0 +1,68 @@
+"""
+attempts_archive(attempts 와 같은 모양으로 한 행씩 옮겨 두던 표)를 압축 블록 표로 바꾼다.
+
+attempts_archive_blocks 는 (날짜, 난이도)마다 보관한 응시 기록을 묶어
+zlib 으로 압축한 JSON 배열 하나로 저장한다. 배열의 각 항목은
+[id, user_id, score, duration_seconds, created_at, weak_tags, tag_misses] 이다 (tag_misses 는 모르면 null).
+읽기는 app.services.rollups.iter_archived_attempts() 로 한다.
+
+블록 인코딩은 이 마이그레이션을 만든 시점의 rollups 와 같게 여기에 옮겨 두었다 (import 하지 않음).
+"""
+import json
+import zlib
+
+ARCHIVE_COMPRESS_LEVEL = 6
+
+
+def _pack(records):
+    return zlib.compress(
+        json.dumps(records, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+        ARCHIVE_COMPRESS_LEVEL,
+    )
+
+
+def upgrade(db):
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS attempts_archive_blocks (
+            id INTEGER PRIMARY KEY,
+            day TEXT NOT NULL,
+            difficulty TEXT NOT NULL,
+            first_attempt_id INTEGER NOT NULL,
+            last_attempt_id INTEGER NOT NULL,
+            attempts INTEGER NOT NULL,
+            payload BLOB NOT NULL
+        )
+        """
+    )
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS idx_attempts_archive_blocks_day ON attempts_archive_blocks (day, difficulty)"
+    )
+
+    exists = db.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'attempts_archive'"
+    ).fetchone()
+    if not exists:
+        return
+    blocks = {}
+    for row in db.execute(
+        """
+        SELECT id, user_id, score, duration_seconds, created_at, weak_tags, difficulty
+        FROM attempts_archive ORDER BY id
+        """
+    ):
+        blocks.setdefault((row[4][:10], row[6]), []).append(
+            [row[0], row[1], row[2], row[3], row[4], row[5], None]
+        )
+    db.executemany(
+        """
+        INSERT INTO attempts_archive_blocks
+            (day, difficulty, first_attempt_id, last_attempt_id, attempts, payload)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (day, difficulty, records[0][0], records[-1][0], len(records), _pack(records))
+            for (day, difficulty), records in blocks.items()
+        ],
+    )
+    db.execute("DROP TABLE attempts_archive")
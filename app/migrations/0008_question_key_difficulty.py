@@ -0,0 +1,44 @@
+"""
+문제 content_key 에 난이도를 넣는다 (본문이 같고 난이도만 다른 문제가 한 행으로 합쳐지던 문제).
+
+0003 규칙(주제 + 본문)으로 만들어진 키만 새 규칙(주제 + 난이도 + 본문)으로 다시 채운다.
+시드 레코드의 key 로 들어온 키는 그대로 둔다. 새 규칙으로도 겹치는 행은 0003 처럼 키를 비워 둔다.
+키 계산은 이 마이그레이션을 만든 시점의 app.services.seeding 을 옮겨 둔 것이다 (import 하지 않음).
+"""
+import hashlib
+
+
+def _digest(parts):
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _old_key(row):
+    return _digest((row["topic"].strip(), " ".join(row["question"].split())))
+
+
+def _new_key(row):
+    return _digest((row["topic"].strip(), row["difficulty"].strip(), " ".join(row["question"].split())))
+
+
+def upgrade(db):
+    rows = db.execute(
+        "SELECT id, topic, question, difficulty, content_key FROM questions ORDER BY id"
+    ).fetchall()
+    # 옛 규칙으로 계산되지 않은 키 = 시드 레코드가 직접 준 key
+    explicit = {
+        row["content_key"] for row in rows
+        if row["content_key"] is not None and row["content_key"] != _old_key(row)
+    }
+    seen = set(explicit)
+    updates = []
+    for row in rows:
+        if row["content_key"] in explicit:
+            continue
+        key = _new_key(row)
+        if key in seen:
+            key = None
+        seen.add(key)
+        updates.append((key, row["id"]))
+    # 다시 채우는 도중 UNIQUE 인덱스에 걸리지 않도록 먼저 비운다
+    db.executemany("UPDATE questions SET content_key = NULL WHERE id = ?", [(row_id,) for _key, row_id in updates])
+    db.executemany("UPDATE questions SET content_key = ? WHERE id = ?", updates)
@@ -0,0 +1,13 @@
+"""
+0002 에서 만든 문제 인덱스 두 개를 지운다.
+
+문제 은행(question_bank)이 문제 전체를 메모리에 올려 난이도/주제 필터와 주제 목록을 처리한 뒤로
+difficulty/topic 으로 questions 를 조회하는 쿼리가 없어, 두 인덱스는 적재 때 쓰기 비용만 늘린다.
+"""
+
+INDEXES = ("idx_questions_difficulty_topic", "idx_questions_topic")
+
+
+def upgrade(db):
+    for name in INDEXES:
+        db.execute(f"DROP INDEX IF EXISTS {name}")
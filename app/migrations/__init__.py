@@ -0,0 +1,60 @@
+"""
+PRAGMA user_version 기반 스키마 마이그레이션.
+
+이 패키지의 NNNN_설명.py 파일이 번호 순서대로 적용되며, 각 파일은 upgrade(db) 를 가진다.
+적용이 끝나면 user_version 을 그 번호로 올린다. 스키마가 최신이면 정수 하나만 읽고 끝난다.
+"""
+import importlib
+import os
+import re
+
+MIGRATIONS_DIR = os.path.dirname(__file__)
+_FILENAME_RE = re.compile(r"^(\d{4})_\w+\.py$")
+
+
+def _discover():
+    migrations = []
+    for filename in os.listdir(MIGRATIONS_DIR):
+        match = _FILENAME_RE.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), filename[:-3]))
+    migrations.sort()
+    versions = [version for version, _ in migrations]
+    if len(set(versions)) != len(versions):
+        raise RuntimeError(f"마이그레이션 번호가 중복됩니다: {versions}")
+    return migrations
+
+
+MIGRATIONS = _discover()
+LATEST_VERSION = MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+
+def current_version(db):
+    return db.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(db):
+    """대기 중인 마이그레이션을 적용하고 최종 버전을 돌려준다"""
+    if current_version(db) >= LATEST_VERSION:
+        return LATEST_VERSION
+
+    # 쓰기 잠금을 먼저 잡아 한 프로세스만 마이그레이션하게 하고,
+    # 잠금을 기다리는 동안 다른 프로세스가 끝냈을 수 있으니 버전을 다시 읽는다
+    if db.in_transaction:
+        db.commit()
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        version = current_version(db)
+        for target, module_name in MIGRATIONS:
+            if target <= version:
+                continue
+            module = importlib.import_module(f"{__name__}.{module_name}")
+            module.upgrade(db)
+            db.execute(f"PRAGMA user_version = {target}")
+            print(f"[INFO] DB 마이그레이션 적용: {module_name}")
+            version = target
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return version
@@ -0,0 +1,201 @@
+"""
+요청 단위 SQL 계측.
+
+get_db() 가 돌려주는 연결을 얇게 감싸 문장, 소요 시간, 행 수를 g 에 기록하고,
+요청이 끝나면 Server-Timing 헤더와 한 줄짜리 JSON 로그를 남긴다.
+같은 문장이 한 요청에서 여러 번 반복되면 N+1 의심으로 표시하고, 엔드포인트별 누적 통계를 보관한다.
+"""
+import json
+import os
+import threading
+import time
+
+from flask import g, has_app_context, request
+
+DB_PROFILING = os.getenv("DB_PROFILING", "1") == "1"
+# 요청마다 JSON 로그를 남길지 (0 이면 느린 요청/N+1 의심 요청만)
+DB_PROFILE_LOG_ALL = os.getenv("DB_PROFILE_LOG_ALL", "0") == "1"
+DB_SLOW_REQUEST_MS = float(os.getenv("DB_SLOW_REQUEST_MS", "200"))
+# 같은 문장이 이 횟수 이상 반복되면 N+1 의심
+N_PLUS_ONE_THRESHOLD = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", "5"))
+
+_endpoint_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _record(sql, started, rows):
+    if not has_app_context():
+        return
+    queries = g.get("db_queries")
+    if queries is None:
+        queries = g.db_queries = []
+    queries.append((sql, (time.perf_counter() - started) * 1000, rows))
+
+
+class InstrumentedCursor:
+    """fetch 시점에 읽은 행 수를 기록하는 커서 프록시"""
+
+    def __init__(self, cursor, sql, started):
+        self._cursor = cursor
+        self._sql = sql
+        self._started = started
+        self._rows = 0
+        self._recorded = False
+
+    def _finish(self, rows=0):
+        self._rows += rows
+        if not self._recorded:
+            self._recorded = True
+            _record(self._sql, self._started, self._rows)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        self._finish(1 if row is not None else 0)
+        return row
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._finish(len(rows))
+        return rows
+
+    def fetchmany(self, size=None):
+        rows = self._cursor.fetchmany(size) if size is not None else self._cursor.fetchmany()
+        self._finish(len(rows))
+        return rows
+
+    def __iter__(self):
+        for row in self._cursor:
+            self._rows += 1
+            yield row
+        self._finish()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class InstrumentedConnection:
+    """sqlite3.Connection 프록시. execute/executemany 만 계측하고 나머지는 그대로 위임"""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def execute(self, sql, params=()):
+        started = time.perf_counter()
+        cursor = self._conn.execute(sql, params)
+        if cursor.description is None:
+            # 쓰기 문장은 바로 기록 (rowcount = 영향받은 행 수)
+            _record(sql, started, max(cursor.rowcount, 0))
+            return cursor
+        return InstrumentedCursor(cursor, sql, started)
+
+    def executemany(self, sql, seq_of_params):
+        started = time.perf_counter()
+        cursor = self._conn.executemany(sql, seq_of_params)
+        _record(sql, started, max(cursor.rowcount, 0))
+        return cursor
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def instrument(conn):
+    return InstrumentedConnection(conn) if DB_PROFILING else conn
+
+
+def _normalize(sql):
+    return " ".join(sql.split())
+
+
+def _summarize(queries):
+    total_ms = 0.0
+    counts = {}
+    for sql, duration_ms, _rows in queries:
+        total_ms += duration_ms
+        key = _normalize(sql)
+        counts[key] = counts.get(key, 0) + 1
+    repeated = {sql: count for sql, count in counts.items() if count >= N_PLUS_ONE_THRESHOLD}
+    return total_ms, repeated
+
+
+def _update_endpoint_stats(endpoint, query_count, db_ms, total_ms, n_plus_one):
+    with _stats_lock:
+        stat = _endpoint_stats.setdefault(endpoint, {
+            "requests": 0,
+            "queries": 0,
+            "max_queries": 0,
+            "db_ms": 0.0,
+            "max_db_ms": 0.0,
+            "total_ms": 0.0,
+            "n_plus_one_requests": 0,
+        })
+        stat["requests"] += 1
+        stat["queries"] += query_count
+        stat["max_queries"] = max(stat["max_queries"], query_count)
+        stat["db_ms"] += db_ms
+        stat["max_db_ms"] = max(stat["max_db_ms"], db_ms)
+        stat["total_ms"] += total_ms
+        if n_plus_one:
+            stat["n_plus_one_requests"] += 1
+
+
+def get_endpoint_stats():
+    """엔드포인트별 누적 통계 (평균 포함)"""
+    with _stats_lock:
+        snapshot = {endpoint: dict(stat) for endpoint, stat in _endpoint_stats.items()}
+    for stat in snapshot.values():
+        requests = stat["requests"] or 1
+        stat["avg_queries"] = round(stat["queries"] / requests, 2)
+        stat["avg_db_ms"] = round(stat["db_ms"] / requests, 3)
+        stat["avg_total_ms"] = round(stat["total_ms"] / requests, 3)
+        stat["db_ms"] = round(stat["db_ms"], 3)
+        stat["max_db_ms"] = round(stat["max_db_ms"], 3)
+        stat["total_ms"] = round(stat["total_ms"], 3)
+    return snapshot
+
+
+def reset_endpoint_stats():
+    with _stats_lock:
+        _endpoint_stats.clear()
+
+
+def _before_request():
+    g.request_started = time.perf_counter()
+    g.db_queries = []
+
+
+def _after_request(response):
+    started = g.get("request_started")
+    if started is None:
+        return response
+    queries = g.get("db_queries") or []
+    total_ms = (time.perf_counter() - started) * 1000
+    db_ms, repeated = _summarize(queries)
+    endpoint = request.endpoint or "<unmatched>"
+
+    response.headers.add(
+        "Server-Timing",
+        f'db;dur={db_ms:.2f};desc="{len(queries)} queries", app;dur={total_ms:.2f}',
+    )
+    _update_endpoint_stats(endpoint, len(queries), db_ms, total_ms, bool(repeated))
+
+    if DB_PROFILE_LOG_ALL or repeated or total_ms >= DB_SLOW_REQUEST_MS:
+        record = {
+            "endpoint": endpoint,
+            "method": request.method,
+            "status": response.status_code,
+            "queries": len(queries),
+            "rows": sum(rows for _sql, _ms, rows in queries),
+            "db_ms": round(db_ms, 2),
+            "total_ms": round(total_ms, 2),
+        }
+        if repeated:
+            record["n_plus_one"] = repeated
+        print(f"[PROFILE] {json.dumps(record, ensure_ascii=False)}")
+    return response
+
+
+def init_app(app):
+    if not DB_PROFILING:
+        return
+    app.before_request(_before_request)
+    app.after_request(_after_request)
@@ -1,7 +1,13 @@
-from flask import Blueprint, render_template
-import markdown
+import json
+from flask import Blueprint, Response, render_template
 from ..db import get_db
-from ..services.news import get_tech_news
+from ..services.news import (
+    NEWS_REQUEST_BUDGET_MS,
+    can_stream_detail,
+    get_news_item,
+    get_tech_news,
+    stream_news_detail,
+)
 
 landing_bp = Blueprint("landing", __name__)
 
@@ -13,35 +19,38 @@ def landing():
         "SELECT nickname, best_score, updated_at, difficulty FROM hall_of_fame ORDER BY best_score DESC, best_duration_seconds ASC, updated_at DESC LIMIT 5"
     ).fetchall()
     
-    news_items = get_tech_news()
+    news_items = get_tech_news(budget_ms=NEWS_REQUEST_BUDGET_MS)
     return render_template("landing.html", top_users=top_users, news_items=news_items)
 
 @landing_bp.get("/news")
 def news():
-    news_items = get_tech_news()
+    news_items = get_tech_news(budget_ms=NEWS_REQUEST_BUDGET_MS)
     return render_template("news.html", news_items=news_items)
 
 @landing_bp.get("/news/<news_id>")
 def news_detail(news_id):
     """뉴스 상세 페이지"""
-    news_items = get_tech_news()
-    
-    # news_id로 해당 뉴스 찾기
-    selected_news = None
-    for item in news_items:
-        if str(item.get("id")) == str(news_id):
-            selected_news = item
-            break
-    
+    selected_news = get_news_item(news_id, budget_ms=NEWS_REQUEST_BUDGET_MS)
     if selected_news is None:
         return render_template("404.html"), 404
     
-    # 마크다운을 HTML로 변환 (상세 마크다운 우선)
-    detail_text = selected_news.get("detail_markdown") or selected_news.get("description")
-    if detail_text:
-        selected_news["description_html"] = markdown.markdown(
-            detail_text,
-            extensions=['tables', 'fenced_code']
-        )
-    
-    return render_template("news_detail.html", news=selected_news)
+    return render_template(
+        "news_detail.html",
+        news=selected_news,
+        can_stream=can_stream_detail(selected_news),
+    )
+
+@landing_bp.get("/news/<news_id>/stream")
+def news_detail_stream(news_id):
+    """상세 내용을 GPT 스트리밍으로 생성해 Server-Sent Events 로 전달"""
+    get_news_item(news_id, budget_ms=NEWS_REQUEST_BUDGET_MS)
+
+    def generate():
+        for event, data in stream_news_detail(news_id):
+            yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,65 +1,42 @@
-import random
-from urllib.parse import urlparse, parse_qs
 from datetime import datetime
-from flask import Blueprint, redirect, render_template, request, session, url_for
+from flask import Blueprint, jsonify, redirect, render_template, request, session, url_for
 
 from ..db import get_db
-from ..services import analysis, scoring
+from ..services import analysis, question_bank, results, sampling, scoring
 
 quiz_bp = Blueprint("quiz", __name__)
 
+SAVE_FAILED_MESSAGE = "결과 저장을 확인하지 못했습니다. 명예의 전당에 반영되지 않았을 수 있습니다."
+
 
 @quiz_bp.get("/")
 def index():
-    db = get_db()
-    rows = db.execute("SELECT DISTINCT topic FROM questions ORDER BY topic").fetchall()
-    topics = [row["topic"] for row in rows]
+    topics = question_bank.get_topics(get_db())
     return render_template("index.html", topics=topics)
 
 
-@quiz_bp.post("/start")
-def start():
-    nickname = request.form.get("nickname", "").strip()
-    topic = request.form.get("topic", "all").strip()
-    difficulty = request.form.get("difficulty", "easy").strip()
-
-    if not nickname:
-        return redirect(url_for("quiz.index"))
-
-    db = get_db()
+def _get_or_create_user(db, nickname):
+    """(user_id, 이미 있던 닉네임인지)"""
     row = db.execute("SELECT id FROM users WHERE nickname = ?", (nickname,)).fetchone()
     if row:
-        user_id = row["id"]
-        session["nickname_exists"] = True
-    else:
-        now = datetime.now().strftime("%Y-%m-%d %H:%M")
-        cursor = db.execute(
-            "INSERT INTO users (nickname, created_at) VALUES (?, ?)",
-            (nickname, now),
-        )
-        user_id = cursor.lastrowid
-        db.commit()
+        return row["id"], True
+    now = datetime.now().strftime("%Y-%m-%d %H:%M")
+    cursor = db.execute(
+        "INSERT INTO users (nickname, created_at) VALUES (?, ?)",
+        (nickname, now),
+    )
+    db.commit()
+    return cursor.lastrowid, False
+
+
+def _begin_quiz(db, nickname, topic, difficulty):
+    """문제를 뽑고 세션에 퀴즈 상태를 만든다. 조건에 맞는 문제가 없으면 None"""
+    user_id, nickname_exists = _get_or_create_user(db, nickname)
 
     # 주제와 난이도로 문제 필터링
-    if topic == "all" or not topic:
-        qrows = db.execute(
-            "SELECT id FROM questions WHERE difficulty = ?",
-            (difficulty,)
-        ).fetchall()
-    else:
-        qrows = db.execute(
-            "SELECT id FROM questions WHERE topic = ? AND difficulty = ?",
-            (topic, difficulty)
-        ).fetchall()
-
-    q_ids = [row["id"] for row in qrows]
+    q_ids = sampling.sample_questions(db, topic, difficulty)
     if not q_ids:
-        rows = db.execute("SELECT DISTINCT topic FROM questions ORDER BY topic").fetchall()
-        topics = [r["topic"] for r in rows]
-        return render_template("index.html", topics=topics, error="선택한 조건에 맞는 문제가 없습니다.")
-
-    random.shuffle(q_ids)
-    q_ids = q_ids[:8]
+        return None
 
     session["user_id"] = user_id
     session["nickname"] = nickname
@@ -69,7 +46,58 @@ def start():
     session["answers"] = []
     session["q_index"] = 0
     session["started_at"] = datetime.now().timestamp()
+    if nickname_exists:
+        session["nickname_exists"] = True
     session.modified = True
+    return q_ids
+
+
+def _finish_quiz(db, answers):
+    """채점하고 결과를 저장한 뒤 세션을 비운다. 결과 화면/JSON 에 쓰는 값을 돌려준다"""
+    q_ids = session["q_ids"]
+    questions = question_bank.get_questions(db, q_ids)
+
+    score = scoring.calculate_score(questions, answers)
+    weak_tags = analysis.find_weak_tags(questions, answers)
+    tag_misses = analysis.count_tag_misses(questions, answers)
+    duration_seconds = int(datetime.now().timestamp() - session.get("started_at", datetime.now().timestamp()))
+
+    user_id = session.get("user_id")
+    nickname = session.get("nickname", "")
+    now = datetime.now().strftime("%Y-%m-%d %H:%M")
+
+    difficulty = session.get("difficulty", "")
+    saved = results.save_result(
+        db, user_id, nickname, score, weak_tags, tag_misses, duration_seconds, difficulty, now
+    )
+
+    videos = question_bank.get_tag_videos(db, weak_tags)
+
+    session.clear()
+
+    return {
+        "score": score,
+        "total": len(questions),
+        "nickname": nickname,
+        "weak_tags": weak_tags,
+        "videos": videos,
+        "save_error": "" if saved else SAVE_FAILED_MESSAGE,
+    }
+
+
+@quiz_bp.post("/start")
+def start():
+    nickname = request.form.get("nickname", "").strip()
+    topic = request.form.get("topic", "all").strip()
+    difficulty = request.form.get("difficulty", "easy").strip()
+
+    if not nickname:
+        return redirect(url_for("quiz.index"))
+
+    db = get_db()
+    if _begin_quiz(db, nickname, topic, difficulty) is None:
+        topics = question_bank.get_topics(db)
+        return render_template("index.html", topics=topics, error="선택한 조건에 맞는 문제가 없습니다.")
     return redirect(url_for("quiz.quiz"))
 
 
@@ -95,8 +123,7 @@ def quiz():
     if idx >= len(q_ids):
         return redirect(url_for("quiz.result"))
 
-    db = get_db()
-    question = db.execute("SELECT * FROM questions WHERE id = ?", (q_ids[idx],)).fetchone()
+    question = question_bank.get_question(get_db(), q_ids[idx])
 
     return render_template(
         "quiz.html",
@@ -118,90 +145,70 @@ def result():
     if "q_ids" not in session:
         return redirect(url_for("quiz.index"))
 
-    db = get_db()
-    q_ids = session["q_ids"]
-    questions = [
-        dict(db.execute("SELECT * FROM questions WHERE id = ?", (qid,)).fetchone())
-        for qid in q_ids
-    ]
-    answers = session.get("answers", [])
+    summary = _finish_quiz(get_db(), session.get("answers", []))
+    return render_template("result.html", **summary)
 
-    score = scoring.calculate_score(questions, answers)
-    weak_tags = analysis.find_weak_tags(questions, answers)
-    duration_seconds = int(datetime.now().timestamp() - session.get("started_at", datetime.now().timestamp()))
 
-    user_id = session.get("user_id")
-    nickname = session.get("nickname", "")
-    now = datetime.now().strftime("%Y-%m-%d %H:%M")
+# 한 페이지 모드: 문제 전체를 한 번에 내려주고 답안을 한 번에 받는다.
+# 위의 HTML 흐름(/start → /quiz → /result)은 JS 가 없을 때의 대체 경로로 그대로 둔다.
 
-    db.execute(
-        "INSERT INTO attempts (user_id, score, weak_tags, duration_seconds, created_at) VALUES (?, ?, ?, ?, ?)",
-        (user_id, score, ",".join(weak_tags), duration_seconds, now),
-    )
+@quiz_bp.get("/play")
+def play():
+    topics = question_bank.get_topics(get_db())
+    return render_template("quiz_spa.html", topics=topics)
 
-    difficulty = session.get("difficulty", "")
-    existing = db.execute(
-        "SELECT best_score FROM hall_of_fame WHERE nickname = ?",
-        (nickname,),
-    ).fetchone()
-
-    if existing is None:
-        db.execute(
-            "INSERT INTO hall_of_fame (nickname, best_score, best_duration_seconds, updated_at, difficulty) VALUES (?, ?, ?, ?, ?)",
-            (nickname, score, duration_seconds, now, difficulty),
-        )
-    elif score > existing["best_score"]:
-        db.execute(
-            "UPDATE hall_of_fame SET best_score = ?, best_duration_seconds = ?, updated_at = ?, difficulty = ? WHERE nickname = ?",
-            (score, duration_seconds, now, difficulty, nickname),
-        )
-    elif score == existing["best_score"] and (
-        existing["best_duration_seconds"] == 0 or duration_seconds < existing["best_duration_seconds"]
-    ):
-        db.execute(
-            "UPDATE hall_of_fame SET best_duration_seconds = ?, updated_at = ?, difficulty = ? WHERE nickname = ?",
-            (duration_seconds, now, difficulty, nickname),
-        )
 
-    db.commit()
+@quiz_bp.post("/api/start")
+def api_start():
+    payload = request.get_json(silent=True) or {}
+    nickname = str(payload.get("nickname", "")).strip()
+    topic = str(payload.get("topic", "all")).strip()
+    difficulty = str(payload.get("difficulty", "easy")).strip()
 
-    videos = []
-    for tag in weak_tags:
-        row = db.execute(
-            "SELECT youtube_url FROM concept_videos WHERE concept_tag = ?",
-            (tag,),
-        ).fetchone()
-        if row:
-            raw_url = row["youtube_url"]
-            embed_url = _to_youtube_embed_url(raw_url)
-            videos.append({"tag": tag, "url": raw_url, "embed_url": embed_url})
+    if not nickname:
+        return jsonify({"error": "닉네임을 입력하세요."}), 400
 
-    session.clear()
+    db = get_db()
+    q_ids = _begin_quiz(db, nickname, topic, difficulty)
+    if q_ids is None:
+        return jsonify({"error": "선택한 조건에 맞는 문제가 없습니다."}), 404
+
+    # 뽑은 뒤 삭제/재적재로 없어진 문제는 세션에서도 빼서 답안 개수와 문제 수를 맞춘다
+    loaded = [question for question in question_bank.get_questions(db, q_ids) if question is not None]
+    if len(loaded) != len(q_ids):
+        if not loaded:
+            session.clear()
+            return jsonify({"error": "선택한 조건에 맞는 문제가 없습니다."}), 404
+        session["q_ids"] = [question["id"] for question in loaded]
+
+    # 정답(correct)과 개념 태그는 내려주지 않는다
+    questions = [
+        {
+            "id": question["id"],
+            "question": question["question"],
+            "choices": [
+                {"key": key, "text": question[f"choice_{key.lower()}"]}
+                for key in ("A", "B", "C", "D")
+            ],
+        }
+        for question in loaded
+    ]
+    return jsonify({
+        "nickname_exists": session.pop("nickname_exists", False),
+        "total": len(questions),
+        "questions": questions,
+    })
 
-    return render_template(
-        "result.html",
-        score=score,
-        total=len(questions),
-        nickname=nickname,
-        weak_tags=weak_tags,
-        videos=videos,
-    )
 
+@quiz_bp.post("/api/submit")
+def api_submit():
+    if "q_ids" not in session:
+        return jsonify({"error": "진행 중인 퀴즈가 없습니다."}), 409
+
+    payload = request.get_json(silent=True) or {}
+    answers = payload.get("answers")
+    if not isinstance(answers, list) or len(answers) != len(session["q_ids"]):
+        return jsonify({"error": "답안 개수가 문제 수와 다릅니다."}), 400
+    answers = [answer if answer in ("A", "B", "C", "D") else "" for answer in answers]
 
-def _to_youtube_embed_url(url: str) -> str:
-    if not url:
-        return ""
-    try:
-        parsed = urlparse(url)
-        host = parsed.netloc.lower()
-        video_id = ""
-        if "youtu.be" in host:
-            video_id = parsed.path.lstrip("/")
-        elif "youtube.com" in host:
-            qs = parse_qs(parsed.query)
-            video_id = (qs.get("v") or [""])[0]
-        if not video_id:
-            return ""
-        return f"https://www.youtube.com/embed/{video_id}"
-    except Exception:
-        return ""
+    return jsonify(_finish_quiz(get_db(), answers))
@@ -1,9 +1,13 @@
 import os
 import calendar
 from datetime import date, datetime, timedelta
-from flask import Blueprint, render_template, request, redirect, url_for, session, abort
+from flask import Blueprint, render_template, request, redirect, url_for, session, abort, jsonify
 
+from .. import sessions
 from ..db import get_db
+from ..profiling import get_endpoint_stats
+from ..services import http_client
+from ..services.news import get_llm_stats, get_news_stats
 
 schedule_bp = Blueprint("schedule", __name__)
 
@@ -83,10 +87,10 @@ def schedule():
         """
         SELECT id, title, start_date, end_date, note, include_weekends
         FROM schedules
-        WHERE NOT (end_date < ? OR start_date > ?)
+        WHERE start_date <= ? AND end_date >= ?
         ORDER BY start_date ASC
         """,
-        (start.isoformat(), end.isoformat()),
+        (end.isoformat(), start.isoformat()),
     ).fetchall()
 
     events = []
@@ -141,10 +145,28 @@ def schedule_admin():
     )
 
 
+@schedule_bp.get("/schedule/admin/db-stats")
+def schedule_db_stats():
+    """엔드포인트별 SQL 계측 통계 (관리자 전용)"""
+    if not _is_admin():
+        abort(403)
+    return jsonify(get_endpoint_stats())
+
+
+@schedule_bp.get("/schedule/admin/news-stats")
+def schedule_news_stats():
+    """뉴스 요청 budget 초과 비율과 마지막 갱신의 LLM 사용량, 소스 호스트별 HTTP 통계 (관리자 전용)"""
+    if not _is_admin():
+        abort(403)
+    return jsonify({"budget": get_news_stats(), "llm": get_llm_stats(), "http": http_client.get_stats()})
+
+
 @schedule_bp.post("/schedule/admin/login")
 def schedule_login():
     password = request.form.get("password", "")
     if password and password == os.getenv("ADMIN_PASSWORD"):
+        # 로그인 전에 심어 둔 세션 id 를 그대로 쓰지 않도록 새로 발급
+        sessions.regenerate(session)
         session["is_admin"] = True
     return redirect(url_for("schedule.schedule_admin"))
 
@@ -1,3 +1,3 @@
-from . import scoring, analysis
+from . import scoring, analysis, question_bank, results, rollups, sampling, seeding
 
-__all__ = ["scoring", "analysis"]
+__all__ = ["scoring", "analysis", "question_bank", "results", "rollups", "sampling", "seeding"]
@@ -1,4 +1,5 @@
-def find_weak_tags(questions, answers, limit=3):
+def count_tag_misses(questions, answers):
+    """개념 태그별로 틀린 문제 수"""
     counts = {}
     for question, answer in zip(questions, answers):
         if not question:
@@ -6,6 +7,11 @@ def find_weak_tags(questions, answers, limit=3):
         if answer != question["correct"]:
             tag = question["concept_tag"]
             counts[tag] = counts.get(tag, 0) + 1
+    return counts
+
+
+def find_weak_tags(questions, answers, limit=3):
+    counts = count_tag_misses(questions, answers)
 
     sorted_tags = sorted(counts.items(), key=lambda item: item[1], reverse=True)
     return [tag for tag, _count in sorted_tags[:limit]]
@@ -0,0 +1,119 @@
+"""
+뉴스 소스용 공용 HTTP 클라이언트.
+keep-alive 커넥션 풀을 공유하고, 호스트별 타임아웃과 지터가 들어간 재시도를 적용하며
+소스(호스트)별 요청 시간 통계를 모은다.
+호스트당 커넥션은 POOL_MAXSIZE 개로 막혀 있어(pool_block) 넘치는 요청은 새 커넥션을 열지 않고 반납을 기다린다.
+"""
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# 호스트별 (connect, read) 타임아웃(초)
+HOST_TIMEOUTS = {
+    "hacker-news.firebaseio.com": (2, 3),
+    "api.gitterapp.com": (3, 5),
+    "dev.to": (3, 5),
+}
+DEFAULT_TIMEOUT = (3, 5)
+
+POOL_CONNECTIONS = 8   # 커넥션 풀을 유지할 호스트 수
+POOL_MAXSIZE = 16      # 호스트당 최대 동시 커넥션 수 (HN 병렬 수집 워커 수와 맞춤)
+
+RETRY_POLICY = Retry(
+    total=2,
+    connect=2,
+    read=2,
+    status=2,
+    backoff_factor=0.2,
+    backoff_jitter=0.3,
+    status_forcelist=(500, 502, 503, 504),
+    allowed_methods=frozenset(["GET", "HEAD"]),
+    raise_on_status=False,
+)
+
+_session = None
+_session_lock = threading.Lock()
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _build_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        # 기본값(False)이면 풀이 다 찼을 때 커넥션을 더 열고 쓴 뒤 버려서 호스트당 상한이 지켜지지 않는다
+        pool_block=True,
+        max_retries=RETRY_POLICY,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": "lab-skilleat-news/1.0"})
+    return session
+
+
+def get_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def timeout_for(url):
+    return HOST_TIMEOUTS.get(urlparse(url).hostname or "", DEFAULT_TIMEOUT)
+
+
+def _record(host, elapsed, status_code):
+    """status_code 가 None 이면 응답을 받지 못한 경우(타임아웃, 연결 실패 등)"""
+    with _stats_lock:
+        stat = _stats.setdefault(host, {
+            "requests": 0,
+            "errors": 0,          # 응답 없음 또는 5xx
+            "client_errors": 0,   # 4xx (429 rate limit, 403 등)
+            "total_seconds": 0.0,
+            "max_seconds": 0.0,
+        })
+        stat["requests"] += 1
+        if status_code is None or status_code >= 500:
+            stat["errors"] += 1
+        elif status_code >= 400:
+            stat["client_errors"] += 1
+        stat["total_seconds"] += elapsed
+        stat["max_seconds"] = max(stat["max_seconds"], elapsed)
+
+
+def get(url, timeout=None, **kwargs):
+    """풀링된 세션으로 GET. timeout 을 생략하면 호스트별 기본값 사용"""
+    host = urlparse(url).hostname or ""
+    started = time.perf_counter()
+    status_code = None
+    try:
+        response = get_session().get(url, timeout=timeout or timeout_for(url), **kwargs)
+        status_code = response.status_code
+        return response
+    finally:
+        _record(host, time.perf_counter() - started, status_code)
+
+
+def get_stats():
+    """호스트별 요청 수, 오류(응답 없음/5xx) 수, 4xx 수, 평균/최대 소요 시간"""
+    with _stats_lock:
+        return {
+            host: dict(
+                stat,
+                avg_seconds=(stat["total_seconds"] / stat["requests"]) if stat["requests"] else 0.0,
+            )
+            for host, stat in _stats.items()
+        }
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
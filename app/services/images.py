@@ -0,0 +1,91 @@
+"""
+생성된 뉴스 이미지의 반응형 변형(thumb/card/full) 생성.
+원본 PNG를 줄여 WebP와 JPEG로 저장하고, 파일명에 내용 해시를 넣어 캐시 무효화를 쉽게 한다.
+Pillow가 없으면 변형 없이 원본만 사용한다.
+"""
+import hashlib
+from pathlib import Path
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# 변형 이름 -> 가로 폭(px)
+IMAGE_VARIANTS = {
+    "thumb": 480,
+    "card": 768,
+    "full": 1536,
+}
+IMAGE_FORMATS = {
+    "webp": {"format": "WEBP", "options": {"quality": 78, "method": 6}},
+    "jpeg": {"format": "JPEG", "options": {"quality": 80, "optimize": True, "progressive": True}},
+}
+
+
+# 원본 경로 -> ((mtime_ns, size), 해시). 페이지를 그릴 때마다 PNG 전체를 다시 읽지 않도록 보관
+_hash_cache = {}
+_HASH_CACHE_MAX = 256
+
+
+def _content_hash(path: Path) -> str:
+    stat = path.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _hash_cache.get(str(path))
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()[:12]
+    if len(_hash_cache) >= _HASH_CACHE_MAX:
+        _hash_cache.clear()
+    _hash_cache[str(path)] = (signature, digest)
+    return digest
+
+
+def build_variants(source_path: Path, url_prefix: str):
+    """
+    source_path 이미지의 변형들을 같은 디렉터리에 만들고 템플릿용 메타데이터를 반환한다.
+    이미 만들어진 파일은 건너뛴다. 실패하거나 Pillow가 없으면 None.
+    원본은 헤더(크기)만 읽고, 없는 변형이 있을 때만 픽셀을 디코딩한다.
+    """
+    if Image is None or not source_path.exists():
+        return None
+
+    try:
+        digest = _content_hash(source_path)
+        stem = source_path.stem
+        variants = {fmt: {} for fmt in IMAGE_FORMATS}
+        with Image.open(source_path) as original:
+            original_width, original_height = original.size
+            base = None
+            for name, width in IMAGE_VARIANTS.items():
+                width = min(width, original_width)
+                height = round(original_height * width / original_width)
+                resized = None
+                for fmt, spec in IMAGE_FORMATS.items():
+                    filename = f"{stem}_{name}_{digest}.{fmt}"
+                    target = source_path.with_name(filename)
+                    if not target.exists():
+                        if base is None:
+                            base = original.convert("RGB")
+                        if resized is None:
+                            resized = base.resize((width, height), Image.LANCZOS)
+                        tmp_target = target.with_name(f".{filename}.tmp")
+                        resized.save(tmp_target, spec["format"], **spec["options"])
+                        tmp_target.replace(target)
+                    variants[fmt][name] = {"url": f"{url_prefix}/{filename}", "width": width}
+    except Exception as e:
+        print(f"이미지 변형 생성 실패 ({source_path.name}): {e}")
+        return None
+
+    def srcset(fmt):
+        return ", ".join(f"{v['url']} {v['width']}w" for v in variants[fmt].values())
+
+    return {
+        "image_width": original_width,
+        "image_height": original_height,
+        "image_thumb_url": variants["jpeg"]["thumb"]["url"],
+        "image_card_url": variants["jpeg"]["card"]["url"],
+        "image_full_url": variants["jpeg"]["full"]["url"],
+        "image_srcset_webp": srcset("webp"),
+        "image_srcset_jpeg": srcset("jpeg"),
+    }
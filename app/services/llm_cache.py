@@ -0,0 +1,85 @@
+"""
+뉴스 요약 GPT 결과를 SQLite(news_llm_cache 테이블)에 보관하는 캐시.
+(source, story_id, 제목 해시, 프롬프트 버전)이 같으면 다시 호출하지 않는다.
+요청 컨텍스트 밖(백그라운드 갱신 스레드)에서도 쓰이므로 flask.g 대신 스레드별 연결을 쓴다.
+"""
+import hashlib
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+from ..db import get_thread_db
+
+LLM_CACHE_MAX_AGE = int(os.getenv("NEWS_LLM_CACHE_MAX_AGE", str(86400 * 14)))  # 14일
+LLM_CACHE_MAX_ROWS = int(os.getenv("NEWS_LLM_CACHE_MAX_ROWS", "500"))
+
+
+@contextmanager
+def _savepoint():
+    """
+    캐시 쓰기를 SAVEPOINT 로 감싼다. 같은 스레드 연결에 요청 트랜잭션이 열려 있으면 그 안에 중첩되어
+    요청 쪽 변경을 커밋/롤백하지 않고(커밋은 요청이 정한다), 열려 있지 않으면 RELEASE 가 곧 커밋이다.
+    별도 연결을 쓰면 요청이 쓰기 락을 쥔 동안 busy_timeout 만큼 기다리다 실패하므로 같은 연결을 쓴다.
+    """
+    conn = get_thread_db()
+    conn.execute("SAVEPOINT llm_cache")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK TO llm_cache")
+        conn.execute("RELEASE llm_cache")
+        raise
+    conn.execute("RELEASE llm_cache")
+
+
+def title_hash(title: str) -> str:
+    return hashlib.sha256((title or "").strip().encode("utf-8")).hexdigest()[:16]
+
+
+def get_completion(source, story_id, title, prompt_version):
+    """캐시된 GPT 응답 원문. 없거나 DB를 쓸 수 없으면 None"""
+    try:
+        row = get_thread_db().execute(
+            """
+            SELECT content FROM news_llm_cache
+            WHERE source = ? AND story_id = ? AND title_hash = ? AND prompt_version = ?
+            """,
+            (source, str(story_id), title_hash(title), prompt_version),
+        ).fetchone()
+    except sqlite3.Error as e:
+        print(f"LLM 캐시 조회 실패: {e}")
+        return None
+    return row["content"] if row else None
+
+
+def store_completion(source, story_id, title, prompt_version, content):
+    try:
+        with _savepoint() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO news_llm_cache
+                    (source, story_id, title_hash, prompt_version, content, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (source, str(story_id), title_hash(title), prompt_version, content, time.time()),
+            )
+    except sqlite3.Error as e:
+        print(f"LLM 캐시 저장 실패: {e}")
+
+
+def evict(max_age=LLM_CACHE_MAX_AGE, max_rows=LLM_CACHE_MAX_ROWS):
+    """오래된 항목을 지우고, 남은 항목이 max_rows 를 넘으면 오래된 순으로 정리"""
+    try:
+        with _savepoint() as conn:
+            conn.execute("DELETE FROM news_llm_cache WHERE created_at < ?", (time.time() - max_age,))
+            conn.execute(
+                """
+                DELETE FROM news_llm_cache WHERE rowid NOT IN (
+                    SELECT rowid FROM news_llm_cache ORDER BY created_at DESC LIMIT ?
+                )
+                """,
+                (max_rows,),
+            )
+    except sqlite3.Error as e:
+        print(f"LLM 캐시 정리 실패: {e}")
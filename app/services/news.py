@@ -1,4 +1,3 @@
-import requests
 from datetime import datetime
 from openai import OpenAI
 import time
@@ -7,7 +6,21 @@ import json
 from pathlib import Path
 from dotenv import load_dotenv
 import re
+import markdown
 import base64
+import threading
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from difflib import SequenceMatcher
+from urllib.parse import urlparse
+
+try:
+    import fcntl
+except ImportError:  # Windows 등에서는 프로세스 내부 락만 사용
+    fcntl = None
+
+from ..db import release_thread_db
+from . import http_client, images, llm_cache
 
 load_dotenv()
 # OpenAI 클라이언트 초기화 (API 키가 있으면만 사용)
@@ -27,15 +40,77 @@ CACHE_DIR.mkdir(exist_ok=True)
 CACHE_FILE = CACHE_DIR / "news_cache.json"
 
 # 뉴스 캐시 (메모리에 저장)
+# - soft_ttl 이 지나면 기존 데이터를 그대로 반환하면서 백그라운드에서 한 번만 갱신
+# - hard_ttl 이 지나면 더 이상 오래된 데이터를 쓰지 않고 동기적으로 갱신
 _news_cache = {
     "data": None,
     "timestamp": None,
-    "ttl": 86400  # 24시간
+    "soft_ttl": int(os.getenv("NEWS_CACHE_SOFT_TTL", "86400")),      # 24시간
+    "hard_ttl": int(os.getenv("NEWS_CACHE_HARD_TTL", str(86400 * 7))),  # 7일
+    "last_refresh_failure": None,
+    "file_signature": None,   # 마지막으로 읽은 캐시 파일의 (mtime, size)
+    "file_checked_at": None,  # 마지막으로 캐시 파일을 stat 한 시각
+    "index": {}               # str(id) -> 뉴스 아이템 (상세 페이지 조회용)
+}
+NEWS_CACHE_STAT_INTERVAL = 5  # 캐시 파일 변경 확인 주기(초)
+NEWS_REFRESH_RETRY_SECONDS = 300  # 갱신 실패 후 다음 백그라운드 갱신까지 대기
+
+# 갱신 single-flight 락 (프로세스 내부 + 워커 프로세스 간 파일 락)
+LOCK_FILE = CACHE_DIR / "news_cache.lock"
+_refresh_lock = threading.Lock()
+_refresh_idle = threading.Event()  # 진행 중인 갱신이 없으면 set
+_refresh_idle.set()
+
+# 요청 경로 budget (cold 캐시일 때 갱신을 기다리는 최대 시간)
+NEWS_REQUEST_BUDGET_MS = int(os.getenv("NEWS_REQUEST_BUDGET_MS", "800"))
+_news_stats = {
+    "budget_requests": 0,   # budget 을 걸고 갱신을 기다린 요청 수
+    "budget_exceeded": 0    # 그중 budget 안에 뉴스를 못 받아 캐시/폴백으로 응답한 수
 }
+_news_stats_lock = threading.Lock()
+_quick_fallback = {"date": None, "items": None}
+
+# 상세 내용 SSE 스트리밍 (같은 뉴스는 한 번에 하나만 생성)
+_cache_update_lock = threading.Lock()
+_detail_streams = set()
+_detail_streams_lock = threading.Lock()
 
 GENERATED_DIR = Path(__file__).parent.parent / "static" / "generated"
 GENERATED_DIR.mkdir(parents=True, exist_ok=True)
 
+# HackerNews API (HN_API_BASE 로 스텁 서버 등 다른 주소를 쓸 수 있음)
+HN_API_BASE = os.getenv("HN_API_BASE", "https://hacker-news.firebaseio.com/v0").rstrip("/")
+HN_TOP_STORIES_URL = f"{HN_API_BASE}/topstories.json"
+HN_ITEM_URL = HN_API_BASE + "/item/{}.json"
+
+# HackerNews 아이템 병렬 수집 설정
+HN_ITEM_WORKERS = 16      # 동시 요청 수 상한
+HN_BATCH_DEADLINE = 5     # 배치 전체 마감 시간(초), 넘기면 남은 아이템은 버림
+
+# 요약/이미지 생성 파이프라인 설정
+NEWS_ITEM_LIMIT = 3
+NEWS_LLM_CONCURRENCY = max(1, int(os.getenv("NEWS_LLM_CONCURRENCY", "3")))
+NEWS_IMAGE_CONCURRENCY = max(1, int(os.getenv("NEWS_IMAGE_CONCURRENCY", "3")))
+
+# 갱신 때는 헤드라인+요약만 만들고, 상세(DETAIL)는 상세 페이지를 처음 열 때 스트리밍으로 만든다
+NEWS_SUMMARY_MAX_TOKENS = int(os.getenv("NEWS_SUMMARY_MAX_TOKENS", "800"))   # 아이템 하나의 헤드라인+요약
+NEWS_DETAIL_MAX_TOKENS = int(os.getenv("NEWS_DETAIL_MAX_TOKENS", "3000"))
+
+# 일괄 요약 모드: 후보 전체를 한 번의 GPT 호출로 요약 (시스템 프롬프트를 한 번만 보냄)
+# max_tokens 는 아이템 수 x NEWS_SUMMARY_MAX_TOKENS 로 잡되 NEWS_LLM_BATCH_MAX_TOKENS 를 넘지 않는다
+NEWS_LLM_BATCH = os.getenv("NEWS_LLM_BATCH", "0") == "1"
+NEWS_LLM_BATCH_MAX_TOKENS = int(os.getenv("NEWS_LLM_BATCH_MAX_TOKENS", "4000"))
+
+# 갱신 1회당 LLM 사용량 (토큰 수, 호출 수, 누적 지연 시간)
+_llm_stats = {
+    "calls": 0,
+    "prompt_tokens": 0,
+    "completion_tokens": 0,
+    "total_tokens": 0,
+    "latency_seconds": 0.0
+}
+_llm_stats_lock = threading.Lock()
+
 # 트렌디한 키워드 우선순위 (점수 가중치)
 HOT_KEYWORDS = {
     "ai": 3, "gpt": 3, "claude": 3, "llm": 3, "machine learning": 2,
@@ -47,6 +122,87 @@ HOT_KEYWORDS = {
     "layoff": 1.8, "hiring": 1.5, "interview": 2, "startup": 1.5
 }
 
+# 뉴스 프롬프트 (요약 프롬프트를 바꾸면 NEWS_PROMPT_VERSION, 상세 프롬프트를 바꾸면
+# NEWS_DETAIL_PROMPT_VERSION 도 올릴 것)
+NEWS_PROMPT_VERSION = 3
+NEWS_DETAIL_PROMPT_VERSION = 1
+_NEWS_EDITOR_PERSONA = (
+    "당신은 '감테크' YouTube 채널의 시니어 기술 에디터입니다. "
+    "20-30대 개발자와 학생들이 '오, 이거 봐야겠다!'라고 생각하게 만드는 것이 목표입니다.\n\n"
+)
+
+# 갱신 때 쓰는 헤드라인+요약 프롬프트
+NEWS_SYSTEM_PROMPT = (
+    _NEWS_EDITOR_PERSONA +
+    
+    "## 헤드라인 작성 원칙\n"
+    "- 기술 트렌드의 '진짜 의미'를 짚어내세요 (예: '이거 안 쓰면 뒤처진다', '업계 판도가 바뀐다')\n"
+    "- 구체적 숫자나 임팩트를 넣으세요 (예: '성능 3배', '개발 시간 50% 단축')\n"
+    "- 실무자의 고민을 건드리세요 (예: '면접에서 물어본다', '이제 legacy 된다', '시니어들은 이미 쓴다')\n"
+    "- 이모지 1-2개로 시선 집중 (🚀⚡🔥💀🎯🤯💼🧠)\n"
+    "- 논쟁적이거나 도발적인 각도 환영 (예: '~의 종말', '~가 망했다', '~를 버려야 하는 이유')\n\n"
+    
+    "## 요약 작성 원칙 (최소 5-7문장)\n"
+    "- 첫 문장: 핵심 결론을 단정적으로 ('~입니다', '~됩니다')\n"
+    "- 두 번째: 구체적 수치나 사례 ('X사는 이미~', '벤치마크 결과~')\n"
+    "- 세 번째: 왜 지금 중요한지 실무 맥락 ('현업에서는~', '면접에서 빈출~')\n"
+    "- 네 번째: 기존 방식과의 비교 ('기존 X 대비~', 'Y를 대체할~')\n"
+    "- 다섯 번째: 실무 적용 팁이나 주의점 ('주의할 점은~', '도입 전에~')\n"
+    "- 여섯-일곱 번째: 독자 액션 아이템 ('주목해야 할 이유는~', '지금 배워두면~')\n"
+    "- 마크다운 없이 자연스러운 한국어 문장, 각 문장은 구체적이고 정보량 있게\n\n"
+    
+    "## 출력 형식 (반드시 지킬 것)\n"
+    "HEADLINE: [자극적이고 구체적인 헤드라인]\n"
+    "SUMMARY: [최소 5-7문장의 상세하고 구체적인 한국어 요약, 마크다운 없음]\n"
+    "상세 내용(DETAIL)은 쓰지 마세요.\n\n"
+    
+    "예시 톤:\n"
+    "❌ 나쁜 예: 'Kubernetes 1.30이 출시되었습니다.'\n"
+    "✅ 좋은 예: '🚀 쿠버네티스 1.30 충격! 메모리 사용량 40% 감소, 이제 중소기업도 쓴다'\n\n"
+    
+    "❌ 나쁜 예: 'AI 모델이 개선되었습니다.'\n"
+    "✅ 좋은 예: '🤖 GPT-5 실화냐? 코딩 테스트 만점, 시니어 개발자 위기설'\n\n"
+    
+    "❌ 나쁜 예 (요약): 'React 19가 출시되었습니다.'\n"
+    "✅ 좋은 예 (요약): 'React 19가 정식 출시되면서 useState의 사용 패턴이 완전히 바뀝니다. "
+    "벤치마크 결과 렌더링 성능이 기존 대비 2.3배 향상되었고, Meta 내부에서는 이미 전체 프로덕션에 적용 완료했습니다. "
+    "특히 면접에서 React 19의 새로운 훅 API에 대한 질문이 급증하고 있어 주니어 개발자들은 반드시 숙지해야 합니다. "
+    "기존 클래스 컴포넌트를 사용하던 레거시 프로젝트는 마이그레이션 압박을 받을 것으로 예상됩니다. "
+    "공식 문서에서 제공하는 마이그레이션 가이드를 따르면 대부분의 코드는 자동 변환이 가능하지만, "
+    "useEffect 의존성 배열 처리 방식이 달라져 주의가 필요합니다. "
+    "지금 배워두면 향후 2-3년간 React 생태계에서 경쟁력을 유지할 수 있습니다.'\n\n"
+    
+    "기억하세요: 독자는 바쁜 현업 개발자입니다. "
+    "3초 안에 '아, 이거 내가 알아야 하는 거네' 느끼게 만들고, "
+    "요약만 읽어도 핵심을 완전히 이해할 수 있게 작성하세요!"
+)
+
+# 상세 페이지를 처음 열 때 스트리밍으로 쓰는 상세(DETAIL) 프롬프트
+NEWS_DETAIL_SYSTEM_PROMPT = (
+    _NEWS_EDITOR_PERSONA +
+    
+    "## 상세 내용 구조\n"
+    "반드시 마크다운으로 아래 형식을 따르세요 (HEADLINE, DETAIL: 같은 머리말 없이 본문만):\n\n"
+    "SUMMARY: [한 줄로 핵심 정리 - 강렬하게]\n\n"
+    "## 🎯 핵심 포인트\n"
+    "- [구체적 변화/수치/사례 1 - 최소 2문장]\n"
+    "- [실무 영향 2 - 구체적 시나리오 포함]\n"
+    "- [기술적 의의 3 - 왜 혁신적인지]\n"
+    "- [추가 인사이트 - 놓치기 쉬운 포인트]\n\n"
+    "## 💡 왜 지금 주목해야 하나\n"
+    "- [현업 관점: 채용/면접/프로젝트에서 어떻게 쓰이는가 - 구체적 예시]\n"
+    "- [기술 트렌드: 업계가 어디로 가고 있는가 - 시장 데이터]\n"
+    "- [러닝 포인트: 개발자가 배워야 할 것 - 학습 로드맵 힌트]\n"
+    "- [경쟁 기술 비교: 기존 솔루션 대비 장단점]\n\n"
+    "## 🔥 실무 적용 팁\n"
+    "- [시작하는 방법 - 구체적 첫 걸음]\n"
+    "- [피해야 할 실수 - 현업 경험담]\n"
+    "- [추천 리소스 - 공식 문서, 튜토리얼 등]\n\n"
+    
+    "기억하세요: 독자는 바쁜 현업 개발자입니다. "
+    "각 항목은 구체적인 수치, 사례, 시나리오로 채우고 뻔한 말은 빼세요!"
+)
+
 def _calculate_relevance_score(title: str, score: int) -> float:
     """제목과 점수를 기반으로 관련성 점수 계산"""
     text = (title or "").lower()
@@ -136,6 +292,24 @@ def _parse_headline_and_summary(gpt_content: str, fallback_title: str):
     detail = "\n".join(detail_lines).strip()
     return headline or fallback_title, summary, detail
 
+def _split_batch_response(gpt_content: str, count: int):
+    """일괄 응답을 '=== ITEM n ===' 구분선 기준으로 나눈다. {n: 해당 아이템 응답}"""
+    chunks = {}
+    current = None
+    lines = []
+    for line in gpt_content.splitlines():
+        match = re.match(r"^\s*=+\s*ITEM\s+(\d+)\s*=+\s*$", line)
+        if match:
+            if current is not None:
+                chunks[current] = "\n".join(lines).strip()
+            current = int(match.group(1))
+            lines = []
+        elif current is not None:
+            lines.append(line)
+    if current is not None:
+        chunks[current] = "\n".join(lines).strip()
+    return {n: chunk for n, chunk in chunks.items() if 1 <= n <= count and chunk}
+
 def _safe_image_name(raw_id: str) -> str:
     safe = re.sub(r"[^a-zA-Z0-9_-]", "_", str(raw_id))
     return f"news_{safe}.png"
@@ -181,48 +355,182 @@ def _enrich_news_item(item: dict, title: str):
     image_data = _generate_gpt_image(prompt, item.get("id"))
     if image_data and image_data.get("image_url"):
         item.update(image_data)
+        # 페이지에는 원본 PNG 대신 줄인 WebP/JPEG 변형을 srcset 으로 내보냄
+        variants = images.build_variants(GENERATED_DIR / _safe_image_name(item.get("id")), "/static/generated")
+        if variants:
+            item.update(variants)
     return item
 
-def _load_cache_from_file():
-    """파일에서 캐시 로드"""
-    if CACHE_FILE.exists():
-        try:
-            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
-                if cache_data.get("version") != CACHE_VERSION:
-                    return False
-                _news_cache["data"] = cache_data.get("data")
-                _news_cache["timestamp"] = cache_data.get("timestamp")
-                return _is_cache_valid()
-        except Exception as e:
-            print(f"캐시 로드 실패: {e}")
+def _render_detail_html(item: dict) -> str:
+    # 마크다운을 HTML로 변환 (상세 마크다운 우선)
+    detail_text = item.get("detail_markdown") or item.get("description")
+    if not detail_text:
+        return ""
+    return markdown.markdown(detail_text, extensions=['tables', 'fenced_code'])
+
+def _set_news_data(items, timestamp):
+    """
+    캐시에 뉴스를 넣으면서 상세 페이지용 HTML을 미리 렌더링하고 id 인덱스를 만든다.
+    요청 처리 중에는 캐시된 아이템을 수정하지 않는다.
+    """
+    index = {}
+    for item in items or []:
+        if "description_html" not in item:
+            item["description_html"] = _render_detail_html(item)
+        index[str(item.get("id"))] = item
+    _news_cache["index"] = index
+    _news_cache["data"] = items
+    _news_cache["timestamp"] = timestamp
+
+def _cache_file_signature():
+    """캐시 파일의 (mtime, size). 파일이 없으면 None"""
+    try:
+        stat = CACHE_FILE.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _load_cache_from_file(force=False):
+    """
+    파일에서 캐시 로드.
+    파일의 mtime/size 가 마지막으로 읽은 것과 같으면 다시 파싱하지 않고,
+    stat 도 NEWS_CACHE_STAT_INTERVAL 마다 한 번만 한다.
+    """
+    now = time.time()
+    checked_at = _news_cache["file_checked_at"]
+    if not force and checked_at is not None and (now - checked_at) < NEWS_CACHE_STAT_INTERVAL:
+        return _is_cache_valid()
+    _news_cache["file_checked_at"] = now
+
+    signature = _cache_file_signature()
+    if signature is None:
+        return False
+    if signature == _news_cache["file_signature"]:
+        return _is_cache_valid()
+
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            cache_data = json.load(f)
+        _news_cache["file_signature"] = signature
+        if cache_data.get("version") != CACHE_VERSION:
+            return False
+        _set_news_data(cache_data.get("data"), cache_data.get("timestamp"))
+        print("[INFO] 파일 캐시에서 로드됨")
+        return _is_cache_valid()
+    except Exception as e:
+        print(f"캐시 로드 실패: {e}")
     return False
 
 def _save_cache_to_file():
-    """파일에 캐시 저장"""
+    """파일에 캐시 저장 (읽는 쪽이 쓰다 만 파일을 보지 않도록 교체 방식으로 저장)"""
+    tmp_file = CACHE_FILE.with_name(f"{CACHE_FILE.name}.{os.getpid()}.tmp")
     try:
-        with open(CACHE_FILE, 'w', encoding='utf-8') as f:
+        with open(tmp_file, 'w', encoding='utf-8') as f:
             json.dump({
                 "version": CACHE_VERSION,
                 "data": _news_cache["data"],
                 "timestamp": _news_cache["timestamp"]
             }, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, CACHE_FILE)
+        # 직접 쓴 파일은 다시 읽을 필요 없음
+        _news_cache["file_signature"] = _cache_file_signature()
+        _news_cache["file_checked_at"] = time.time()
     except Exception as e:
         print(f"캐시 저장 실패: {e}")
 
-def _is_cache_valid():
-    """캐시가 유효한지 확인"""
+def _cache_age():
     if _news_cache["data"] is None or _news_cache["timestamp"] is None:
-        return False
-    return (time.time() - _news_cache["timestamp"]) < _news_cache["ttl"]
+        return None
+    return time.time() - _news_cache["timestamp"]
+
+def _is_cache_valid():
+    """캐시가 신선한지(soft TTL 이내) 확인"""
+    age = _cache_age()
+    return age is not None and age < _news_cache["soft_ttl"]
+
+def _is_cache_usable():
+    """오래됐더라도 바로 반환해도 되는지(hard TTL 이내) 확인"""
+    age = _cache_age()
+    return age is not None and age < _news_cache["hard_ttl"]
+
+@contextmanager
+def _cache_file_lock(blocking=True):
+    """워커 프로세스 간 갱신 락. 잡았으면 True, 다른 프로세스가 갱신 중이면 False"""
+    if fcntl is None:
+        yield True
+        return
+    with open(LOCK_FILE, "a") as lock_file:
+        flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        try:
+            fcntl.flock(lock_file, flags)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def _fetch_hn_item(story_id):
+    response = http_client.get(HN_ITEM_URL.format(story_id))
+    return response.json()
+
+def _fetch_hn_items(story_ids, deadline=HN_BATCH_DEADLINE):
+    """HackerNews 아이템을 병렬로 가져오고, 마감 시간 안에 도착한 것만 원래 순서대로 반환"""
+    if not story_ids:
+        return []
+
+    executor = ThreadPoolExecutor(max_workers=min(HN_ITEM_WORKERS, len(story_ids)))
+    futures = {executor.submit(_fetch_hn_item, story_id): story_id for story_id in story_ids}
+    done, not_done = wait(futures, timeout=deadline)
+    # 느린 요청은 기다리지 않고 버린다 (실행 중인 스레드는 타임아웃으로 알아서 정리됨)
+    executor.shutdown(wait=False, cancel_futures=True)
 
-def _fetch_github_trending():
+    fetched = {}
+    for future in done:
+        try:
+            item = future.result()
+        except Exception:
+            continue
+        if isinstance(item, dict):
+            fetched[futures[future]] = item
+
+    if not_done:
+        print(f"[WARN] HackerNews 아이템 {len(not_done)}개가 마감 시간({deadline}s) 초과로 제외됨")
+    return [(story_id, fetched[story_id]) for story_id in story_ids if story_id in fetched]
+
+def _fetch_hackernews(max_items=50):
+    """HackerNews 상위 글 가져오기 (최근 72시간 필터)"""
+    response = http_client.get(HN_TOP_STORIES_URL)
+    top_story_ids = response.json()[:max_items]  # 넉넉히 가져와 72시간 필터 적용
+    
+    now_ts = time.time()
+    max_age_seconds = 72 * 3600
+    
+    items = []
+    for story_id, item in _fetch_hn_items(top_story_ids):
+        if "title" in item and "url" in item and "time" in item:
+            if (now_ts - item.get("time", 0)) > max_age_seconds:
+                continue
+            title = item.get("title", "")
+            items.append({
+                "id": story_id,
+                "title": title,
+                "original_title": title,
+                "source": "HackerNews",
+                "url": item.get("url", ""),
+                "score": item.get("score", 0),
+                "by": item.get("by", "Anonymous")
+            })
+    return items
+
+def _fetch_github_trending(max_items=3):
     """GitHub Trending 저장소 가져오기"""
     try:
         # 비공식 API 사용 (github-trending-api)
         url = "https://api.gitterapp.com/repositories"
-        response = requests.get(url, timeout=5)
-        repos = response.json()[:3]
+        response = http_client.get(url)
+        repos = response.json()[:max_items]
         
         items = []
         for repo in repos:
@@ -240,15 +548,15 @@ def _fetch_github_trending():
         print(f"GitHub Trending 가져오기 실패: {e}")
         return []
 
-def _fetch_devto_posts():
+def _fetch_devto_posts(max_items=3):
     """Dev.to 인기 글 가져오기"""
     try:
-        url = "https://dev.to/api/articles?per_page=5&top=7"  # 최근 7일 TOP
-        response = requests.get(url, timeout=5)
+        url = f"https://dev.to/api/articles?per_page={max_items}&top=7"  # 최근 7일 TOP
+        response = http_client.get(url)
         articles = response.json()
         
         items = []
-        for article in articles[:3]:
+        for article in articles[:max_items]:
             items.append({
                 "id": f"devto_{article.get('id')}",
                 "title": article.get("title", ""),
@@ -263,262 +571,677 @@ def _fetch_devto_posts():
         print(f"Dev.to 가져오기 실패: {e}")
         return []
 
-def get_tech_news():
+# 뉴스 소스 레지스트리
+# - budget: 소스별 수집 시간 한도(초). 넘기면 그 소스 결과만 버림
+# - max_items: 소스에서 가져올 최대 후보 수
+# - score_weight: 소스마다 점수 단위가 달라(HN 포인트, GitHub 스타 등) 관련성 계산 전에 곱함
+_news_sources = {}
+
+def register_news_source(name, fetch, budget=5, max_items=10, score_weight=1.0):
+    _news_sources[name] = {
+        "name": name,
+        "fetch": fetch,
+        "budget": budget,
+        "max_items": max_items,
+        "score_weight": score_weight
+    }
+
+register_news_source("HackerNews", _fetch_hackernews, budget=HN_BATCH_DEADLINE + 2, max_items=50)
+register_news_source("GitHub", _fetch_github_trending, budget=4, max_items=3, score_weight=0.1)
+register_news_source("Dev.to", _fetch_devto_posts, budget=4, max_items=3)
+
+# 사용할 소스 (쉼표 구분, 레지스트리 이름 기준)
+NEWS_SOURCES_ENABLED = [
+    name.strip() for name in os.getenv("NEWS_SOURCES", "HackerNews,GitHub,Dev.to").split(",") if name.strip()
+]
+TITLE_SIMILARITY_THRESHOLD = 0.9  # 이 이상 비슷한 제목은 같은 글로 간주
+
+def _fetch_from_sources(sources):
     """
-    여러 소스에서 최신 기술 뉴스를 가져오고,
-    GPT를 사용해 자극적인 제목과 한글 요약을 생성합니다.
-    메모리와 파일 캐싱을 통해 성능을 최적화합니다.
+    모든 소스를 동시에 수집한다. 각 소스는 자기 budget 안에 끝난 경우에만 반영되므로
+    느린 소스가 다른 소스를 늦추지 않는다.
     """
-    print("[INFO] get_tech_news() 호출됨")
-    
-    # 파일 캐시 우선 로드 (크론 갱신 반영)
-    if _load_cache_from_file():
-        print("[INFO] 파일 캐시에서 로드됨")
-        return _news_cache["data"]
+    if not sources:
+        return []
 
-    # 메모리 캐시 확인
-    if _is_cache_valid():
-        print("[INFO] 메모리 캐시에서 반환")
-        return _news_cache["data"]
-    
-    print("[INFO] 새로운 뉴스 데이터 생성 중...")
-    try:
-        # 여러 소스에서 뉴스 수집
-        all_candidates = []
-        
-        # 1. HackerNews에서 상위 30개 가져오기 (최근 72시간 필터)
-        print("[INFO] HackerNews 데이터 수집 중...")
-        top_stories_url = "https://hacker-news.firebaseio.com/v0/topstories.json"
-        response = requests.get(top_stories_url, timeout=5)
-        top_story_ids = response.json()[:50]  # 넉넉히 가져와 72시간 필터 적용
-        
-        story_url = "https://hacker-news.firebaseio.com/v0/item/{}.json"
-        now_ts = time.time()
-        max_age_seconds = 72 * 3600
-        
-        for story_id in top_story_ids:
+    executor = ThreadPoolExecutor(max_workers=len(sources))
+    started = time.monotonic()
+    futures = {executor.submit(source["fetch"], source["max_items"]): source for source in sources}
+
+    candidates = []
+    pending = set(futures)
+    while pending:
+        elapsed = time.monotonic() - started
+        for future in [f for f in pending if futures[f]["budget"] <= elapsed and not f.done()]:
+            source = futures[future]
+            print(f"[WARN] {source['name']} 수집 시간 초과({source['budget']}s), 제외")
+            pending.discard(future)
+        if not pending:
+            break
+
+        next_deadline = min(futures[f]["budget"] for f in pending) - elapsed
+        done, _ = wait(pending, timeout=max(0, next_deadline), return_when=FIRST_COMPLETED)
+        for future in done:
+            pending.discard(future)
+            source = futures[future]
             try:
-                item_response = requests.get(story_url.format(story_id), timeout=3)
-                item = item_response.json()
-                
-                if "title" in item and "url" in item and "time" in item:
-                    if (now_ts - item.get("time", 0)) > max_age_seconds:
-                        continue
-                    score = item.get("score", 0)
-                    title = item.get("title", "")
-                    relevance_score = _calculate_relevance_score(title, score)
-                    
-                    all_candidates.append({
-                        "id": story_id,
-                        "title": title,
-                        "original_title": title,
-                        "source": "HackerNews",
-                        "url": item.get("url", ""),
-                        "score": score,
-                        "relevance_score": relevance_score,
-                        "by": item.get("by", "Anonymous")
-                    })
-            except:
+                items = future.result()
+            except Exception as e:
+                print(f"[WARN] {source['name']} 수집 실패: {e}")
                 continue
-        
-        # 2. GitHub Trending (선택적)
-        # github_items = _fetch_github_trending()
-        # all_candidates.extend(github_items)
-        
-        # 3. Dev.to (선택적)
-        # devto_items = _fetch_devto_posts()
-        # all_candidates.extend(devto_items)
-        
-        # 관련성 점수로 정렬하고 상위 5개 선택
-        all_candidates.sort(key=lambda x: x.get("relevance_score", x.get("score", 0)), reverse=True)
-        top_candidates = all_candidates[:5]
-        
-        print(f"[INFO] 상위 5개 후보 선택 완료 (총 {len(all_candidates)}개 중)")
-        
-        # GPT로 요약 및 변환
-        news_items = []
-        for item in top_candidates:
-            original_title = item.get("title", "")
+            print(f"[INFO] {source['name']}: 후보 {len(items)}개 ({time.monotonic() - started:.2f}s)")
+            for item in items:
+                weighted_score = item.get("score", 0) * source["score_weight"]
+                item["relevance_score"] = _calculate_relevance_score(item.get("title", ""), weighted_score)
+                candidates.append(item)
+    executor.shutdown(wait=False, cancel_futures=True)
+    return candidates
+
+def _canonical_url(url: str) -> str:
+    if not url:
+        return ""
+    parsed = urlparse(url.strip())
+    host = (parsed.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = "&".join(
+        part for part in sorted(parsed.query.split("&"))
+        if part and not part.lower().startswith(("utm_", "ref="))
+    )
+    path = parsed.path.rstrip("/")
+    return f"{host}{path}" + (f"?{query}" if query else "")
+
+def _normalize_title(title: str) -> str:
+    return re.sub(r"[^a-z0-9가-힣]+", " ", (title or "").lower()).strip()
+
+def _dedupe_candidates(candidates):
+    """같은 URL이거나 제목이 거의 같은 후보는 관련성 점수가 높은 것 하나만 남긴다"""
+    ranked = sorted(candidates, key=lambda x: x.get("relevance_score", x.get("score", 0)), reverse=True)
+    kept = []
+    seen_urls = set()
+    kept_titles = []
+    for item in ranked:
+        url_key = _canonical_url(item.get("url", ""))
+        if url_key and url_key in seen_urls:
+            continue
+        title_key = _normalize_title(item.get("title", ""))
+        if title_key and any(
+            SequenceMatcher(None, title_key, other).ratio() >= TITLE_SIMILARITY_THRESHOLD
+            for other in kept_titles
+        ):
+            continue
+        if url_key:
+            seen_urls.add(url_key)
+        if title_key:
+            kept_titles.append(title_key)
+        kept.append(item)
+    return kept
+
+def _build_summary_messages(item: dict):
+    original_title = item.get("title", "")
+    return [
+        {"role": "system", "content": NEWS_SYSTEM_PROMPT},
+        {
+            "role": "user",
+            "content": (
+                f"다음 영어 기술 글 제목을 기반으로 "
+                f"자극적인 헤드라인과 상세한 한국어 요약(최소 5-7문장)을 작성해줘.\n\n"
+                f"원문 제목:\n{original_title}\n\n"
+                f"출처: {item.get('source', 'HackerNews')}\n"
+                f"점수: {item.get('score', 0)}"
+            )
+        }
+    ]
+
+def _build_detail_messages(item: dict):
+    """상세(DETAIL) 스트리밍용 메시지. 이미 만든 요약을 함께 보내 상세가 요약과 어긋나지 않게 한다"""
+    return [
+        {"role": "system", "content": NEWS_DETAIL_SYSTEM_PROMPT},
+        {
+            "role": "user",
+            "content": (
+                f"다음 영어 기술 글의 상세 내용을 작성해줘.\n\n"
+                f"원문 제목:\n{item.get('title', '')}\n\n"
+                f"한글 요약:\n{item.get('description', '')}\n\n"
+                f"출처: {item.get('source', 'HackerNews')}\n"
+                f"점수: {item.get('score', 0)}"
+            )
+        }
+    ]
+
+def _detail_cache_source(source):
+    """상세 응답은 요약 응답과 같은 LLM 캐시 테이블에 source 를 달리해 저장한다"""
+    return f"{source}#detail"
+
+def _parse_detail(gpt_content: str) -> str:
+    """상세 응답에서 모델이 붙였을 수 있는 'DETAIL:' 머리말을 떼어낸다"""
+    detail = (gpt_content or "").strip()
+    if detail.startswith("DETAIL:"):
+        detail = detail.split("DETAIL:", 1)[1].strip()
+    return detail
+
+def _default_description(item: dict) -> str:
+    return f"Posted by {item.get('by', 'Anonymous')} with {item.get('score', 0)} points"
+
+def _build_batch_summary_messages(items):
+    parts = []
+    for idx, item in enumerate(items, start=1):
+        parts.append(
+            f"[ITEM {idx}]\n"
+            f"원문 제목:\n{item.get('title', '')}\n"
+            f"출처: {item.get('source', 'HackerNews')}\n"
+            f"점수: {item.get('score', 0)}"
+        )
+    return [
+        {"role": "system", "content": NEWS_SYSTEM_PROMPT},
+        {
+            "role": "user",
+            "content": (
+                f"다음 영어 기술 글 {len(items)}개 각각에 대해 "
+                f"자극적인 헤드라인과 상세한 한국어 요약(최소 5-7문장)을 작성해줘.\n"
+                f"각 글의 결과는 반드시 '=== ITEM 번호 ===' 줄로 시작하고, "
+                f"그 아래에 출력 형식(HEADLINE/SUMMARY)을 그대로 따라줘.\n\n"
+                + "\n\n".join(parts)
+            )
+        }
+    ]
+
+def _reset_llm_stats():
+    with _llm_stats_lock:
+        _llm_stats.update(calls=0, prompt_tokens=0, completion_tokens=0, total_tokens=0, latency_seconds=0.0)
+
+def get_llm_stats():
+    """마지막(진행 중인) 갱신의 LLM 호출 수, 토큰 수, 누적 지연 시간"""
+    with _llm_stats_lock:
+        return dict(_llm_stats)
+
+def _record_llm_usage(usage):
+    if usage is None:
+        return
+    with _llm_stats_lock:
+        _llm_stats["prompt_tokens"] += getattr(usage, "prompt_tokens", 0) or 0
+        _llm_stats["completion_tokens"] += getattr(usage, "completion_tokens", 0) or 0
+        _llm_stats["total_tokens"] += getattr(usage, "total_tokens", 0) or 0
+
+def _chat_completion(messages, max_tokens):
+    """
+    chat completion 호출 + 토큰/지연 시간 기록. (응답 본문, finish_reason) 을 반환.
+    finish_reason 이 "length" 면 max_tokens 에서 잘린 응답이다.
+    """
+    started = time.perf_counter()
+    try:
+        gpt_response = client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=messages,
+            temperature=0.8,  # 창의성 증가
+            max_tokens=max_tokens
+        )
+    finally:
+        elapsed = time.perf_counter() - started
+        with _llm_stats_lock:
+            _llm_stats["calls"] += 1
+            _llm_stats["latency_seconds"] += elapsed
+    _record_llm_usage(getattr(gpt_response, "usage", None))
+    choice = gpt_response.choices[0]
+    return choice.message.content.strip(), getattr(choice, "finish_reason", None)
+
+def _summarize_batch(candidates):
+    """
+    캐시에 없는 후보들을 한 번의 GPT 호출로 요약한다.
+    후보 인덱스 -> 해당 아이템의 GPT 응답 조각. 파싱에 실패한 아이템은 빠지며 개별 호출로 처리된다.
+    max_tokens 는 아이템 수에 맞춰 잡고, 응답이 max_tokens 에서 잘렸으면 마지막 조각은 버린다
+    (잘린 응답이 LLM 캐시에 남으면 TTL 동안 계속 잘린 요약이 보이기 때문).
+    """
+    pending = [
+        (idx, item) for idx, item in enumerate(candidates)
+        if llm_cache.get_completion(
+            item.get("source", "HackerNews"), item.get("id"), item.get("title", ""), NEWS_PROMPT_VERSION
+        ) is None
+    ]
+    if len(pending) < 2:
+        return {}
+
+    try:
+        gpt_content, finish_reason = _chat_completion(
+            _build_batch_summary_messages([item for _idx, item in pending]),
+            max_tokens=min(NEWS_LLM_BATCH_MAX_TOKENS, NEWS_SUMMARY_MAX_TOKENS * len(pending))
+        )
+    except Exception as e:
+        print(f"GPT 일괄 요약 실패, 개별 호출로 전환: {e}")
+        return {}
+
+    chunks = _split_batch_response(gpt_content, len(pending))
+    if finish_reason == "length" and chunks:
+        truncated = max(chunks)
+        print(f"[WARN] GPT 일괄 응답이 max_tokens 에서 잘림, ITEM {truncated} 은 개별 호출로 처리")
+        del chunks[truncated]
+    results = {}
+    for position, (idx, item) in enumerate(pending, start=1):
+        chunk = chunks.get(position)
+        if chunk and _parse_headline_and_summary(chunk, item.get("title", ""))[1]:
+            results[idx] = chunk
+    missing = len(pending) - len(results)
+    if missing:
+        print(f"[WARN] GPT 일괄 응답 중 {missing}개 파싱 실패, 개별 호출로 처리")
+    return results
+
+def _summarize_candidate(item: dict, gpt_content=None) -> dict:
+    """
+    후보 하나를 GPT로 요약해 뉴스 아이템을 만든다. 실패하면 원본 데이터로 폴백.
+    gpt_content 가 주어지면(일괄 요약 결과) GPT를 다시 호출하지 않는다.
+    상세(detail_markdown)는 만들지 않고, 이전에 스트리밍으로 만든 상세가 LLM 캐시에 있을 때만 채운다.
+    """
+    original_title = item.get("title", "")
+    
+    try:
+        source = item.get("source", "HackerNews")
+        if gpt_content is None:
+            # 이전 갱신에서 같은 글을 이미 요약했다면 GPT 호출 없이 재사용
+            gpt_content = llm_cache.get_completion(
+                source, item.get("id"), original_title, NEWS_PROMPT_VERSION
+            )
+            if gpt_content is not None:
+                print(f"[DEBUG] GPT 캐시 사용 (story_id={item.get('id')})")
+        truncated = False
+        if gpt_content is None and client:
+            gpt_content, finish_reason = _chat_completion(
+                _build_summary_messages(item), max_tokens=NEWS_SUMMARY_MAX_TOKENS
+            )
+            truncated = finish_reason == "length"
+            print(f"[DEBUG] GPT 응답 (story_id={item.get('id')}): {gpt_content[:200]}...")
+
+        if gpt_content is not None:
+            # GPT 응답 파싱
+            new_title, description, _detail = _parse_headline_and_summary(
+                gpt_content, original_title
+            )
+            cached_detail = llm_cache.get_completion(
+                _detail_cache_source(source), item.get("id"), original_title, NEWS_DETAIL_PROMPT_VERSION
+            )
+            detail_markdown = _parse_detail(cached_detail) if cached_detail else ""
             
+            if truncated:
+                # 잘린 응답은 캐시하지 않아 다음 갱신 때 다시 요약한다
+                print(f"[WARN] GPT 응답이 max_tokens 에서 잘림 (story_id={item.get('id')})")
+            if description and not truncated:
+                # 캐시 히트도 다시 저장해 created_at 을 갱신 (최근에 쓰인 항목이 오래 남도록)
+                llm_cache.store_completion(
+                    source, item.get("id"), original_title, NEWS_PROMPT_VERSION, gpt_content
+                )
+            elif not description:
+                # 파싱 실패 시 폴백
+                description = _default_description(item)
+        else:
+            # API 키가 없으면 원본 사용
+            print("[DEBUG] OpenAI API 키가 없습니다")
+            new_title = original_title
+            description = _default_description(item)
+            detail_markdown = ""
+        
+        return {
+            "id": item.get("id"),
+            "title": new_title,
+            "original_title": original_title,
+            "source": item.get("source", "HackerNews"),
+            "url": item.get("url", ""),
+            "date": datetime.now().strftime("%Y-%m-%d"),
+            "description": description,
+            "summary": description,
+            "short_description": description[:200] if description else "",
+            "detail_markdown": detail_markdown if detail_markdown else "",
+            "score": item.get("score", 0),
+            "relevance_score": item.get("relevance_score", 0)
+        }
+    except Exception as e:
+        # GPT 호출 실패시 원본 데이터 사용
+        print(f"GPT 처리 실패 (story_id={item.get('id')}): {e}")
+        return {
+            "id": item.get("id"),
+            "title": original_title,
+            "original_title": original_title,
+            "source": item.get("source", "HackerNews"),
+            "url": item.get("url", ""),
+            "date": datetime.now().strftime("%Y-%m-%d"),
+            "description": _default_description(item),
+            "summary": _default_description(item),
+            "short_description": f"Posted by {item.get('by', 'Anonymous')}",
+            "detail_markdown": "",
+            "score": item.get("score", 0),
+            "relevance_score": item.get("relevance_score", 0)
+        }
+
+def _summarize_in_worker(item, gpt_content):
+    """llm_pool 워커용. 풀은 갱신이 끝나면 사라지므로 워커가 연 LLM 캐시 연결을 바로 닫는다"""
+    try:
+        return _summarize_candidate(item, gpt_content)
+    finally:
+        release_thread_db()
+
+def _summarize_and_enrich(candidates):
+    """
+    후보들을 병렬로 요약하고, 요약이 끝난 아이템부터 바로 이미지 생성을 시작한다.
+    결과 순서는 후보 순서를 그대로 유지한다.
+    """
+    if not candidates:
+        return []
+
+    batch_contents = _summarize_batch(candidates) if (NEWS_LLM_BATCH and client) else {}
+
+    news_items = [None] * len(candidates)
+    with ThreadPoolExecutor(max_workers=NEWS_LLM_CONCURRENCY) as llm_pool, \
+            ThreadPoolExecutor(max_workers=NEWS_IMAGE_CONCURRENCY) as image_pool:
+        summary_futures = {
+            llm_pool.submit(_summarize_in_worker, item, batch_contents.get(idx)): idx
+            for idx, item in enumerate(candidates)
+        }
+        image_futures = []
+        for future in as_completed(summary_futures):
+            idx = summary_futures[future]
+            new_item = future.result()
+            news_items[idx] = new_item
+            image_futures.append(image_pool.submit(
+                _enrich_news_item, new_item, new_item["original_title"] or new_item["title"]
+            ))
+        for future in image_futures:
             try:
-                if client:
-                    gpt_response = client.chat.completions.create(
-                        model="gpt-3.5-turbo",
-                        messages=[
-                            {
-                                "role": "system",
-                                "content": (
-                                    "당신은 '감테크' YouTube 채널의 시니어 기술 에디터입니다. "
-                                    "20-30대 개발자와 학생들이 '오, 이거 봐야겠다!'라고 생각하게 만드는 것이 목표입니다.\n\n"
-                                    
-                                    "## 헤드라인 작성 원칙\n"
-                                    "- 기술 트렌드의 '진짜 의미'를 짚어내세요 (예: '이거 안 쓰면 뒤처진다', '업계 판도가 바뀐다')\n"
-                                    "- 구체적 숫자나 임팩트를 넣으세요 (예: '성능 3배', '개발 시간 50% 단축')\n"
-                                    "- 실무자의 고민을 건드리세요 (예: '면접에서 물어본다', '이제 legacy 된다', '시니어들은 이미 쓴다')\n"
-                                    "- 이모지 1-2개로 시선 집중 (🚀⚡🔥💀🎯🤯💼🧠)\n"
-                                    "- 논쟁적이거나 도발적인 각도 환영 (예: '~의 종말', '~가 망했다', '~를 버려야 하는 이유')\n\n"
-                                    
-                                    "## 요약 작성 원칙 (최소 5-7문장)\n"
-                                    "- 첫 문장: 핵심 결론을 단정적으로 ('~입니다', '~됩니다')\n"
-                                    "- 두 번째: 구체적 수치나 사례 ('X사는 이미~', '벤치마크 결과~')\n"
-                                    "- 세 번째: 왜 지금 중요한지 실무 맥락 ('현업에서는~', '면접에서 빈출~')\n"
-                                    "- 네 번째: 기존 방식과의 비교 ('기존 X 대비~', 'Y를 대체할~')\n"
-                                    "- 다섯 번째: 실무 적용 팁이나 주의점 ('주의할 점은~', '도입 전에~')\n"
-                                    "- 여섯-일곱 번째: 독자 액션 아이템 ('주목해야 할 이유는~', '지금 배워두면~')\n"
-                                    "- 마크다운 없이 자연스러운 한국어 문장, 각 문장은 구체적이고 정보량 있게\n\n"
-                                    
-                                    "## 상세 내용 구조\n"
-                                    "DETAIL: 뒤에는 반드시 마크다운으로 아래 형식을 따르세요:\n\n"
-                                    "SUMMARY: [한 줄로 핵심 정리 - 강렬하게]\n\n"
-                                    "## 🎯 핵심 포인트\n"
-                                    "- [구체적 변화/수치/사례 1 - 최소 2문장]\n"
-                                    "- [실무 영향 2 - 구체적 시나리오 포함]\n"
-                                    "- [기술적 의의 3 - 왜 혁신적인지]\n"
-                                    "- [추가 인사이트 - 놓치기 쉬운 포인트]\n\n"
-                                    "## 💡 왜 지금 주목해야 하나\n"
-                                    "- [현업 관점: 채용/면접/프로젝트에서 어떻게 쓰이는가 - 구체적 예시]\n"
-                                    "- [기술 트렌드: 업계가 어디로 가고 있는가 - 시장 데이터]\n"
-                                    "- [러닝 포인트: 개발자가 배워야 할 것 - 학습 로드맵 힌트]\n"
-                                    "- [경쟁 기술 비교: 기존 솔루션 대비 장단점]\n\n"
-                                    "## 🔥 실무 적용 팁\n"
-                                    "- [시작하는 방법 - 구체적 첫 걸음]\n"
-                                    "- [피해야 할 실수 - 현업 경험담]\n"
-                                    "- [추천 리소스 - 공식 문서, 튜토리얼 등]\n\n"
-                                    
-                                    "## 출력 형식 (반드시 지킬 것)\n"
-                                    "HEADLINE: [자극적이고 구체적인 헤드라인]\n"
-                                    "SUMMARY: [최소 5-7문장의 상세하고 구체적인 한국어 요약, 마크다운 없음]\n"
-                                    "DETAIL:\n"
-                                    "SUMMARY: [한 줄 핵심]\n"
-                                    "## 🎯 핵심 포인트\n...\n"
-                                    "## 💡 왜 지금 주목해야 하나\n...\n"
-                                    "## 🔥 실무 적용 팁\n...\n\n"
-                                    
-                                    "예시 톤:\n"
-                                    "❌ 나쁜 예: 'Kubernetes 1.30이 출시되었습니다.'\n"
-                                    "✅ 좋은 예: '🚀 쿠버네티스 1.30 충격! 메모리 사용량 40% 감소, 이제 중소기업도 쓴다'\n\n"
-                                    
-                                    "❌ 나쁜 예: 'AI 모델이 개선되었습니다.'\n"
-                                    "✅ 좋은 예: '🤖 GPT-5 실화냐? 코딩 테스트 만점, 시니어 개발자 위기설'\n\n"
-                                    
-                                    "❌ 나쁜 예 (요약): 'React 19가 출시되었습니다.'\n"
-                                    "✅ 좋은 예 (요약): 'React 19가 정식 출시되면서 useState의 사용 패턴이 완전히 바뀝니다. "
-                                    "벤치마크 결과 렌더링 성능이 기존 대비 2.3배 향상되었고, Meta 내부에서는 이미 전체 프로덕션에 적용 완료했습니다. "
-                                    "특히 면접에서 React 19의 새로운 훅 API에 대한 질문이 급증하고 있어 주니어 개발자들은 반드시 숙지해야 합니다. "
-                                    "기존 클래스 컴포넌트를 사용하던 레거시 프로젝트는 마이그레이션 압박을 받을 것으로 예상됩니다. "
-                                    "공식 문서에서 제공하는 마이그레이션 가이드를 따르면 대부분의 코드는 자동 변환이 가능하지만, "
-                                    "useEffect 의존성 배열 처리 방식이 달라져 주의가 필요합니다. "
-                                    "지금 배워두면 향후 2-3년간 React 생태계에서 경쟁력을 유지할 수 있습니다.'\n\n"
-                                    
-                                    "기억하세요: 독자는 바쁜 현업 개발자입니다. "
-                                    "3초 안에 '아, 이거 내가 알아야 하는 거네' 느끼게 만들고, "
-                                    "요약만 읽어도 핵심을 완전히 이해할 수 있게 작성하세요!"
-                                )
-                            },
-                            {
-                                "role": "user",
-                                "content": (
-                                    f"다음 영어 기술 글 제목을 기반으로 "
-                                    f"자극적인 헤드라인과 상세한 한국어 요약(최소 5-7문장)을 작성해줘.\n\n"
-                                    f"원문 제목:\n{original_title}\n\n"
-                                    f"출처: {item.get('source', 'HackerNews')}\n"
-                                    f"점수: {item.get('score', 0)}"
-                                )
-                            }
-                        ],
-                        temperature=0.8,  # 창의성 증가
-                        max_tokens=3000   # 토큰 증가
-                    )
-                    
-                    gpt_content = gpt_response.choices[0].message.content.strip()
-                    print(f"[DEBUG] GPT 응답 (story_id={item.get('id')}): {gpt_content[:200]}...")
-                    
-                    # GPT 응답 파싱
-                    new_title, description, detail_markdown = _parse_headline_and_summary(
-                        gpt_content, original_title
-                    )
-                    
-                    # 파싱 실패 시 폴백
-                    if not description:
-                        description = f"Posted by {item.get('by', 'Anonymous')} with {item.get('score', 0)} points"
-                else:
-                    # API 키가 없으면 원본 사용
-                    print("[DEBUG] OpenAI API 키가 없습니다")
-                    new_title = original_title
-                    description = f"Posted by {item.get('by', 'Anonymous')} with {item.get('score', 0)} points"
-                    detail_markdown = ""
-                
-                # 새 아이템 생성 (모든 필드 포함)
-                new_item = {
-                    "id": item.get("id"),
-                    "title": new_title,
-                    "original_title": original_title,
-                    "source": item.get("source", "HackerNews"),
-                    "url": item.get("url", ""),
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "description": description,
-                    "summary": description,
-                    "short_description": description[:200] if description else "",
-                    "detail_markdown": detail_markdown if detail_markdown else "",
-                    "score": item.get("score", 0),
-                    "relevance_score": item.get("relevance_score", 0)
-                }
-                
-                # 리스트에 추가하고 이미지/이모지 enrichment
-                news_items.append(new_item)
-                _enrich_news_item(news_items[-1], original_title or new_title)
-                
-                if len(news_items) >= 3:
-                    break
-                    
+                future.result()
             except Exception as e:
-                # GPT 호출 실패시 원본 데이터 사용
-                print(f"GPT 처리 실패 (story_id={item.get('id')}): {e}")
-                new_item = {
-                    "id": item.get("id"),
-                    "title": original_title,
-                    "original_title": original_title,
-                    "source": item.get("source", "HackerNews"),
-                    "url": item.get("url", ""),
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "description": f"Posted by {item.get('by', 'Anonymous')} with {item.get('score', 0)} points",
-                    "summary": f"Posted by {item.get('by', 'Anonymous')} with {item.get('score', 0)} points",
-                    "short_description": f"Posted by {item.get('by', 'Anonymous')}",
-                    "detail_markdown": "",
-                    "score": item.get("score", 0),
-                    "relevance_score": item.get("relevance_score", 0)
-                }
-                
-                news_items.append(new_item)
-                _enrich_news_item(news_items[-1], original_title)
-                
-                if len(news_items) >= 3:
-                    break
-        
-        result = news_items if news_items else get_fallback_news()
-        
-        # 캐시에 저장 (메모리 + 파일)
-        _news_cache["data"] = result
-        _news_cache["timestamp"] = time.time()
-        _save_cache_to_file()
-        
+                print(f"이미지 enrichment 실패: {e}")
+    return news_items
+
+def _build_news():
+    """뉴스 수집 → 요약 → 이미지 생성 파이프라인 (캐시는 건드리지 않음)"""
+    http_client.reset_stats()
+    _reset_llm_stats()
+    # 여러 소스에서 뉴스를 동시에 수집하고 중복 제거 후 관련성 점수로 정렬
+    sources = [_news_sources[name] for name in NEWS_SOURCES_ENABLED if name in _news_sources]
+    print(f"[INFO] 뉴스 소스 수집 중: {', '.join(source['name'] for source in sources)}")
+    all_candidates = _dedupe_candidates(_fetch_from_sources(sources))
+    if not all_candidates:
+        raise RuntimeError("어떤 소스에서도 뉴스 후보를 가져오지 못했습니다")
+    
+    # 상위 5개 선택
+    top_candidates = all_candidates[:5]
+    
+    print(f"[INFO] 상위 5개 후보 선택 완료 (총 {len(all_candidates)}개 중)")
+    
+    # GPT로 요약 및 변환 (요약은 병렬, 이미지는 헤드라인이 나오는 대로 생성)
+    news_items = _summarize_and_enrich(top_candidates[:NEWS_ITEM_LIMIT])
+    llm_cache.evict()
+    
+    llm_stats = get_llm_stats()
+    print(
+        f"[INFO] LLM({'batch' if NEWS_LLM_BATCH else 'per-item'}): {llm_stats['calls']}회, "
+        f"토큰 {llm_stats['prompt_tokens']}+{llm_stats['completion_tokens']}={llm_stats['total_tokens']}, "
+        f"누적 {llm_stats['latency_seconds']:.2f}s"
+    )
+    for host, stat in http_client.get_stats().items():
+        print(
+            f"[INFO] HTTP {host}: {stat['requests']}건, 오류 {stat['errors']}건, 4xx {stat['client_errors']}건, "
+            f"평균 {stat['avg_seconds'] * 1000:.0f}ms, 최대 {stat['max_seconds'] * 1000:.0f}ms"
+        )
+    budget_stats = get_news_stats()
+    print(
+        f"[INFO] 요청 budget: {budget_stats['budget_requests']}건 중 "
+        f"{budget_stats['budget_exceeded']}건 초과 ({budget_stats['budget_exceeded_ratio']:.1%})"
+    )
+    
+    return news_items if news_items else get_fallback_news()
+
+def _store_news(result):
+    _set_news_data(result, time.time())
+    _save_cache_to_file()
+
+def _refresh_news():
+    """
+    뉴스를 새로 만들어 캐시(메모리 + 파일)에 저장한다.
+    실패하면 쓸 만한 기존 데이터는 유지하고, 없을 때만 폴백 뉴스를 캐시한다.
+    """
+    print("[INFO] 새로운 뉴스 데이터 생성 중...")
+    try:
+        result = _build_news()
+        _store_news(result)
         print(f"[INFO] 뉴스 {len(result)}개 생성 완료")
         return result
     except Exception as e:
         print(f"[ERROR] 뉴스 가져오기 실패: {e}")
-        # 뉴스를 가져오지 못한 경우 기본 뉴스 반환
+        _news_cache["last_refresh_failure"] = time.time()
+        if _is_cache_usable():
+            return _news_cache["data"]
+        # 뉴스를 가져오지 못한 경우 기본 뉴스 반환 (폴백 뉴스도 캐시)
         result = get_fallback_news()
-        
-        # 폴백 뉴스도 캐시 (메모리 + 파일)
-        _news_cache["data"] = result
-        _news_cache["timestamp"] = time.time()
-        _save_cache_to_file()
-        
+        _store_news(result)
         return result
 
-def get_fallback_news():
+def _refresh_single_flight():
+    """동기 갱신. 동시에 들어온 요청들은 먼저 들어온 갱신 결과를 함께 사용한다"""
+    with _refresh_lock:
+        _refresh_idle.clear()
+        try:
+            # 락을 기다리는 동안 다른 스레드/프로세스가 갱신했을 수 있음
+            if _load_cache_from_file(force=True) or _is_cache_valid():
+                return _news_cache["data"]
+            with _cache_file_lock(blocking=True):
+                _load_cache_from_file(force=True)
+                if _is_cache_valid():
+                    return _news_cache["data"]
+                return _refresh_news()
+        finally:
+            _refresh_idle.set()
+
+def _background_refresh():
+    try:
+        with _cache_file_lock(blocking=False) as acquired:
+            if not acquired:
+                print("[INFO] 다른 프로세스가 뉴스 갱신 중")
+                return
+            _load_cache_from_file(force=True)
+            if not _is_cache_valid():
+                _refresh_news()
+    finally:
+        release_thread_db()
+        _refresh_idle.set()
+        _refresh_lock.release()
+
+def _trigger_background_refresh():
+    """백그라운드 갱신을 한 번만 시작. 새로 시작했으면 True"""
+    last_failure = _news_cache["last_refresh_failure"]
+    if last_failure and (time.time() - last_failure) < NEWS_REFRESH_RETRY_SECONDS:
+        return False
+    if not _refresh_lock.acquire(blocking=False):
+        return False
+    try:
+        _refresh_idle.clear()
+        threading.Thread(target=_background_refresh, name="news-refresh", daemon=True).start()
+    except Exception:
+        _refresh_idle.set()
+        _refresh_lock.release()
+        raise
+    return True
+
+def _update_cached_item(news_id, updates):
+    """캐시된 뉴스 하나를 새 dict 로 교체하고 파일 캐시에도 반영 (다른 요청이 보던 dict 는 수정하지 않음)"""
+    with _cache_update_lock:
+        items = _news_cache["data"] or []
+        new_items = [
+            dict(item, **updates) if str(item.get("id")) == str(news_id) else item
+            for item in items
+        ]
+        if new_items == items:
+            return False
+        _set_news_data(new_items, _news_cache["timestamp"])
+        _save_cache_to_file()
+        return True
+
+def can_stream_detail(item):
+    """
+    상세 마크다운이 아직 없고 GPT 를 쓸 수 있으면 SSE 로 실시간 생성 가능.
+    갱신은 헤드라인+요약만 만들기 때문에 상세 페이지를 처음 열 때는 보통 여기로 온다.
+    """
+    return bool(client) and bool(item) and not item.get("detail_markdown")
+
+def stream_news_detail(news_id):
+    """
+    상세 내용을 GPT 스트리밍으로 생성하며 (event, data) 를 차례로 내보낸다.
+    - ("delta", 텍스트 조각) ... ("done", {"html": ...}) 순서
+    - 이미 상세가 있으면 바로 done, 같은 뉴스를 다른 요청이 생성 중이면 pending
+    끝나면 결과를 뉴스 캐시와 LLM 캐시에 저장해 이후 조회는 바로 보이게 한다.
+    """
+    item = _news_cache["index"].get(str(news_id))
+    if item is None:
+        yield "error", {"message": "not found"}
+        return
+    if not can_stream_detail(item):
+        yield "done", {"html": item.get("description_html", "")}
+        return
+
+    with _detail_streams_lock:
+        if str(news_id) in _detail_streams:
+            yield "pending", {}
+            return
+        _detail_streams.add(str(news_id))
+
+    try:
+        original_title = item.get("original_title") or item.get("title", "")
+        candidate = {
+            "id": item.get("id"),
+            "title": original_title,
+            "source": item.get("source", "HackerNews"),
+            "score": item.get("score", 0),
+            "description": item.get("description", "")
+        }
+        started = time.perf_counter()
+        stream = client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=_build_detail_messages(candidate),
+            temperature=0.8,
+            max_tokens=NEWS_DETAIL_MAX_TOKENS,
+            stream=True,
+            # 마지막 청크(choices 가 빈 청크)에 토큰 사용량이 실려 온다
+            stream_options={"include_usage": True}
+        )
+        parts = []
+        finish_reason = None
+        usage = None
+        for chunk in stream:
+            if getattr(chunk, "usage", None) is not None:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            finish_reason = chunk.choices[0].finish_reason or finish_reason
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield "delta", delta
+        with _llm_stats_lock:
+            _llm_stats["calls"] += 1
+            _llm_stats["latency_seconds"] += time.perf_counter() - started
+        _record_llm_usage(usage)
+
+        gpt_content = "".join(parts).strip()
+        detail_markdown = _parse_detail(gpt_content)
+        if not detail_markdown:
+            yield "error", {"message": "empty detail"}
+            return
+
+        updates = {"detail_markdown": detail_markdown}
+        if finish_reason == "length":
+            # 잘린 상세는 이번 갱신 동안만 보여 주고 LLM 캐시에는 남기지 않는다
+            print(f"[WARN] GPT 상세 응답이 max_tokens 에서 잘림 (news_id={news_id})")
+        else:
+            llm_cache.store_completion(
+                _detail_cache_source(candidate["source"]), candidate["id"], original_title,
+                NEWS_DETAIL_PROMPT_VERSION, gpt_content
+            )
+        updated = dict(item, **updates)
+        updates["description_html"] = _render_detail_html(updated)
+        _update_cached_item(news_id, updates)
+        yield "done", {"html": updates["description_html"]}
+    except Exception as e:
+        print(f"GPT 상세 스트리밍 실패 (news_id={news_id}): {e}")
+        yield "error", {"message": "stream failed"}
+    finally:
+        with _detail_streams_lock:
+            _detail_streams.discard(str(news_id))
+
+def _count_budget_request(exceeded):
+    with _news_stats_lock:
+        _news_stats["budget_requests"] += 1
+        if exceeded:
+            _news_stats["budget_exceeded"] += 1
+
+def get_news_stats():
+    """요청 budget 통계 (budget 안에 신선한 뉴스를 못 받은 비율 포함)"""
+    with _news_stats_lock:
+        stats = dict(_news_stats)
+    requests_count = stats["budget_requests"]
+    stats["budget_exceeded_ratio"] = (stats["budget_exceeded"] / requests_count) if requests_count else 0.0
+    return stats
+
+def get_tech_news(budget_ms=None):
+    """
+    여러 소스에서 최신 기술 뉴스를 가져오고,
+    GPT를 사용해 자극적인 제목과 한글 요약을 생성합니다.
+    캐시가 soft TTL을 넘기면 기존 데이터를 바로 반환하고 백그라운드에서 갱신하며,
+    hard TTL을 넘겼거나 데이터가 없을 때만 갱신을 기다립니다.
+    budget_ms 를 주면 그 시간까지만 기다리고, 그래도 없으면 마지막 캐시나 폴백 뉴스를 반환합니다
+    (갱신은 백그라운드에서 계속되어 끝나면 캐시에 반영됨).
+    """
+    print("[INFO] get_tech_news() 호출됨")
+    
+    # 파일 캐시 우선 확인 (크론 갱신 반영, 파일이 바뀐 경우에만 다시 읽음)
+    if _load_cache_from_file():
+        return _news_cache["data"]
+
+    # 메모리 캐시 확인
+    if _is_cache_valid():
+        print("[INFO] 메모리 캐시에서 반환")
+        return _news_cache["data"]
+
+    # 오래됐지만 쓸 수 있는 캐시는 바로 반환하고 갱신은 백그라운드로
+    if _is_cache_usable():
+        if _trigger_background_refresh():
+            print("[INFO] 오래된 캐시 반환, 백그라운드 갱신 시작")
+        return _news_cache["data"]
+
+    if budget_ms is None:
+        return _refresh_single_flight()
+
+    # 요청 budget 안에서만 갱신을 기다림
+    _trigger_background_refresh()
+    _refresh_idle.wait(budget_ms / 1000)
+    if _is_cache_usable():
+        _count_budget_request(exceeded=False)
+        return _news_cache["data"]
+
+    _count_budget_request(exceeded=True)
+    print(f"[WARN] 뉴스 budget({budget_ms}ms) 초과, 캐시/폴백 뉴스로 응답")
+    return _news_cache["data"] or _get_quick_fallback_news()
+
+def get_news_item(news_id, budget_ms=None):
+    """id로 뉴스 아이템 조회 (없으면 None)"""
+    news_items = get_tech_news(budget_ms=budget_ms)
+    item = _news_cache["index"].get(str(news_id))
+    if item is None:
+        # budget 초과로 캐시 밖의 폴백 뉴스를 받은 경우
+        item = next((i for i in news_items if str(i.get("id")) == str(news_id)), None)
+    return item
+
+def _get_quick_fallback_news():
+    """이미지 생성 없이 만든 폴백 뉴스 (요청 경로에서 바로 쓸 수 있게 날짜별로 한 번만 생성)"""
+    today = datetime.now().strftime("%Y-%m-%d")
+    if _quick_fallback["date"] != today:
+        items = get_fallback_news(with_images=False)
+        for item in items:
+            item["description_html"] = _render_detail_html(item)
+        _quick_fallback["items"] = items
+        _quick_fallback["date"] = today
+    return _quick_fallback["items"]
+
+def get_fallback_news(with_images=True):
     """
     API 요청 실패 시 기본 뉴스를 반환합니다.
+    with_images=False 면 이미지 생성 없이 이모지만 붙입니다.
     """
     items = [
         {
@@ -613,5 +1336,9 @@ def get_fallback_news():
         }
     ]
     for item in items:
-        _enrich_news_item(item, item.get("original_title") or item.get("title"))
+        title = item.get("original_title") or item.get("title")
+        if with_images:
+            _enrich_news_item(item, title)
+        else:
+            item["emoji"] = _pick_emoji(title)
     return items
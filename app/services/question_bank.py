@@ -0,0 +1,196 @@
+"""
+프로세스 단위 문제 은행 캐시.
+
+questions 테이블을 한 번 읽어 불변 Question 레코드로 들고 있고, (topic, difficulty) 별 id 목록으로 나눠 둔다.
+개념 태그별 학습 영상(concept_videos)도 임베드 URL 까지 계산해 함께 들고 있는다.
+meta.data_version 이 바뀌면(시드 적재, 관리자 수정 등 bump_data_version 호출) 다시 읽는다.
+버전 확인은 QUESTION_BANK_CHECK_INTERVAL 초에 한 번, meta 의 한 행만 조회한다.
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import parse_qs, urlparse
+
+QUESTION_FIELDS = (
+    "id",
+    "topic",
+    "question",
+    "choice_a",
+    "choice_b",
+    "choice_c",
+    "choice_d",
+    "correct",
+    "concept_tag",
+    "difficulty",
+)
+# IN (...) 한 번에 넣는 id 수 (SQLite 변수 개수 제한 이하)
+ID_LOOKUP_CHUNK = 500
+DATA_VERSION_KEY = "data_version"
+QUESTION_BANK_CHECK_INTERVAL = float(os.getenv("QUESTION_BANK_CHECK_INTERVAL", "5"))
+
+
+class Question(namedtuple("_Question", QUESTION_FIELDS)):
+    """question["choice_a"] 처럼 sqlite3.Row 와 같은 방식으로도 읽을 수 있는 불변 레코드"""
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+
+    def keys(self):
+        return self._fields
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+
+_bank = {
+    "version": None,
+    "checked_at": 0.0,
+    "by_id": {},
+    "partitions": {},      # (topic, difficulty) -> (id, ...)
+    "by_difficulty": {},   # difficulty -> (id, ...)
+    "topics": (),
+    "videos": {},          # concept_tag -> {"tag", "url", "embed_url"}
+}
+_bank_lock = threading.Lock()
+
+
+def get_data_version(db):
+    try:
+        row = db.execute("SELECT value FROM meta WHERE key = ?", (DATA_VERSION_KEY,)).fetchone()
+    except sqlite3.OperationalError:
+        # meta 테이블이 아직 없는 DB (마이그레이션 전)
+        return 0
+    return int(row[0]) if row else 0
+
+
+def bump_data_version(db):
+    """문제/영상 데이터를 바꾼 쪽에서 호출한다. 커밋은 호출하는 쪽에서 한다"""
+    db.execute(
+        """
+        INSERT INTO meta (key, value) VALUES (?, '1')
+        ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1
+        """,
+        (DATA_VERSION_KEY,),
+    )
+
+
+def _load(db, version):
+    by_id, partitions, by_difficulty = {}, {}, {}
+    rows = db.execute(f"SELECT {', '.join(QUESTION_FIELDS)} FROM questions ORDER BY id").fetchall()
+    for row in rows:
+        question = Question(*row)
+        by_id[question.id] = question
+        partitions.setdefault((question.topic, question.difficulty), []).append(question.id)
+        by_difficulty.setdefault(question.difficulty, []).append(question.id)
+    videos = {}
+    for tag, url in db.execute("SELECT concept_tag, youtube_url FROM concept_videos ORDER BY id").fetchall():
+        # 태그당 첫 번째 영상만 쓴다
+        if tag not in videos:
+            videos[tag] = {"tag": tag, "url": url, "embed_url": to_youtube_embed_url(url)}
+    _bank.update(
+        version=version,
+        videos=videos,
+        by_id=by_id,
+        partitions={key: tuple(ids) for key, ids in partitions.items()},
+        by_difficulty={key: tuple(ids) for key, ids in by_difficulty.items()},
+        topics=tuple(sorted({topic for topic, _difficulty in partitions})),
+    )
+    print(f"[INFO] 문제 은행 캐시 적재: {len(by_id)}문제, 버전 {version}")
+
+
+def _ensure_fresh(db):
+    now = time.monotonic()
+    if _bank["version"] is not None and now - _bank["checked_at"] < QUESTION_BANK_CHECK_INTERVAL:
+        return
+    version = get_data_version(db)
+    if version != _bank["version"]:
+        with _bank_lock:
+            if version != _bank["version"]:
+                _load(db, version)
+    _bank["checked_at"] = now
+
+
+def invalidate():
+    """다음 조회 때 버전과 상관없이 다시 읽게 한다"""
+    _bank["version"] = None
+
+
+def get_topics(db):
+    _ensure_fresh(db)
+    return _bank["topics"]
+
+
+def get_question_ids(db, topic, difficulty):
+    """topic 이 'all' 이거나 비어 있으면 난이도만으로 고른다"""
+    _ensure_fresh(db)
+    if topic == "all" or not topic:
+        return _bank["by_difficulty"].get(difficulty, ())
+    return _bank["partitions"].get((topic, difficulty), ())
+
+
+def get_question(db, question_id):
+    _ensure_fresh(db)
+    return _bank["by_id"].get(question_id)
+
+
+def fetch_questions(db, question_ids):
+    """캐시를 거치지 않고 IN (...) 으로 한 번에 읽는다. {id: Question}"""
+    found = {}
+    question_ids = list(question_ids)
+    for start in range(0, len(question_ids), ID_LOOKUP_CHUNK):
+        chunk = question_ids[start:start + ID_LOOKUP_CHUNK]
+        rows = db.execute(
+            f"SELECT {', '.join(QUESTION_FIELDS)} FROM questions WHERE id IN ({','.join('?' * len(chunk))})",
+            chunk,
+        ).fetchall()
+        for row in rows:
+            found[row[0]] = Question(*row)
+    return found
+
+
+def get_questions(db, question_ids):
+    """id 순서대로 Question 목록 (없어진 문제는 None)"""
+    _ensure_fresh(db)
+    by_id = _bank["by_id"]
+    questions = [by_id.get(question_id) for question_id in question_ids]
+    missing = [question_id for question_id, question in zip(question_ids, questions) if question is None]
+    if missing:
+        # 버전 확인 주기 사이에 추가된 문제는 한 번의 쿼리로 보충
+        found = fetch_questions(db, set(missing))
+        questions = [question or found.get(question_id) for question_id, question in zip(question_ids, questions)]
+    return questions
+
+
+def get_tag_videos(db, tags):
+    """태그 순서대로 학습 영상 목록 (영상이 없는 태그는 빠진다)"""
+    _ensure_fresh(db)
+    videos = _bank["videos"]
+    return [dict(videos[tag]) for tag in tags if tag in videos]
+
+
+def to_youtube_embed_url(url: str) -> str:
+    if not url:
+        return ""
+    try:
+        parsed = urlparse(url)
+        host = parsed.netloc.lower()
+        video_id = ""
+        if "youtu.be" in host:
+            video_id = parsed.path.lstrip("/")
+        elif "youtube.com" in host:
+            qs = parse_qs(parsed.query)
+            video_id = (qs.get("v") or [""])[0]
+        if not video_id:
+            return ""
+        return f"https://www.youtube.com/embed/{video_id}"
+    except Exception:
+        return ""
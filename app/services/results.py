@@ -0,0 +1,208 @@
+"""
+퀴즈 결과 저장 (attempts + hall_of_fame).
+
+RESULT_WRITE_MODE=sync (기본)   : 요청 안에서 바로 쓰고 커밋
+RESULT_WRITE_MODE=queue         : 단일 writer 스레드가 큐에 쌓인 결과를 모아서 한 트랜잭션으로 커밋(group commit)
+
+queue 모드의 내구성은 RESULT_DURABILITY 로 고른다.
+    none   : 큐에 넣고 바로 응답 (프로세스가 죽으면 아직 커밋 안 된 결과는 유실)
+    commit : group commit 이 끝날 때까지 기다린 뒤 응답 (WAL + synchronous=NORMAL)
+    full   : commit 과 같되 writer 연결을 synchronous=FULL 로 둔다 (전원 장애에도 유지)
+
+writer 스레드는 프로세스마다 하나다. gunicorn 워커가 여러 개면 워커 수만큼 writer 가 생기므로
+쓰기 락 경합은 워커 안의 요청 스레드끼리에서만 사라지고, 워커 사이에서는 줄어들 뿐 남는다
+(워커 사이 경합은 busy_timeout 으로 기다린다).
+"""
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from ..db import get_thread_db, release_thread_db
+
+RESULT_WRITE_MODE = os.getenv("RESULT_WRITE_MODE", "sync")
+RESULT_DURABILITY = os.getenv("RESULT_DURABILITY", "commit")
+RESULT_GROUP_COMMIT_MS = float(os.getenv("RESULT_GROUP_COMMIT_MS", "20"))
+RESULT_BATCH_MAX = int(os.getenv("RESULT_BATCH_MAX", "64"))
+# 응답이 group commit 을 기다리는 최대 시간 (초)
+RESULT_WRITE_TIMEOUT = float(os.getenv("RESULT_WRITE_TIMEOUT", "5"))
+
+_queue = queue.Queue()
+_writer = None
+_writer_lock = threading.Lock()
+_STOP = object()
+
+
+def record_result(db, user_id, nickname, score, weak_tags, tag_misses, duration_seconds, difficulty, now):
+    """
+    attempts 기록과 명예의 전당 갱신. 커밋은 호출하는 쪽에서 한다.
+    weak_tags 는 화면에 보여 준 상위 약점 태그, tag_misses 는 {태그: 틀린 문제 수} (집계용).
+    """
+    db.execute(
+        "INSERT INTO attempts (user_id, score, weak_tags, tag_misses, duration_seconds, difficulty, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (
+            user_id, score, ",".join(weak_tags),
+            json.dumps(tag_misses, ensure_ascii=False, separators=(",", ":")),
+            duration_seconds, difficulty, now,
+        ),
+    )
+
+    existing = db.execute(
+        "SELECT best_score, best_duration_seconds FROM hall_of_fame WHERE nickname = ?",
+        (nickname,),
+    ).fetchone()
+
+    if existing is None:
+        db.execute(
+            "INSERT INTO hall_of_fame (nickname, best_score, best_duration_seconds, updated_at, difficulty) VALUES (?, ?, ?, ?, ?)",
+            (nickname, score, duration_seconds, now, difficulty),
+        )
+    elif score > existing["best_score"]:
+        db.execute(
+            "UPDATE hall_of_fame SET best_score = ?, best_duration_seconds = ?, updated_at = ?, difficulty = ? WHERE nickname = ?",
+            (score, duration_seconds, now, difficulty, nickname),
+        )
+    elif score == existing["best_score"] and (
+        existing["best_duration_seconds"] == 0 or duration_seconds < existing["best_duration_seconds"]
+    ):
+        db.execute(
+            "UPDATE hall_of_fame SET best_duration_seconds = ?, updated_at = ?, difficulty = ? WHERE nickname = ?",
+            (duration_seconds, now, difficulty, nickname),
+        )
+
+
+class _PendingResult:
+    def __init__(self, args):
+        self.args = args
+        self.done = threading.Event()
+        self.error = None
+
+
+def _write_batch(db, batch):
+    try:
+        db.execute("BEGIN IMMEDIATE")
+        for item in batch:
+            record_result(db, *item.args)
+        db.commit()
+    except Exception as e:
+        # sqlite3 오류뿐 아니라 잘못된 인자 등으로 writer 스레드가 죽지 않도록 모두 잡는다
+        try:
+            db.rollback()
+        except sqlite3.Error:
+            pass
+        if len(batch) == 1:
+            batch[0].error = e
+            print(f"[ERROR] 퀴즈 결과 저장 실패: {e}")
+            return
+        # 한 건 때문에 묶음 전체를 잃지 않도록 하나씩 다시 시도
+        for item in batch:
+            _write_batch(db, [item])
+
+
+def _writer_db():
+    db = get_thread_db()
+    if RESULT_DURABILITY == "full":
+        db.execute("PRAGMA synchronous=FULL")
+    return db
+
+
+def _commit_batch(batch):
+    """묶음을 커밋하고, 성공이든 실패든 기다리는 요청을 모두 깨운다"""
+    try:
+        _write_batch(_writer_db(), batch)
+    except Exception as e:
+        # writer 연결을 못 여는 경우 등: 묶음 전체를 실패로 돌린다
+        print(f"[ERROR] 퀴즈 결과 writer 오류: {e}")
+        for item in batch:
+            if item.error is None:
+                item.error = e
+    finally:
+        for item in batch:
+            item.done.set()
+
+
+def _writer_loop():
+    stopping = False
+    while not stopping:
+        first = _queue.get()
+        if first is _STOP:
+            break
+        batch = [first]
+        # 첫 건을 받은 뒤 잠깐 더 모아서 한 번에 커밋
+        deadline = time.monotonic() + RESULT_GROUP_COMMIT_MS / 1000
+        while len(batch) < RESULT_BATCH_MAX:
+            remaining = deadline - time.monotonic()
+            try:
+                item = _queue.get(timeout=max(remaining, 0)) if remaining > 0 else _queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                stopping = True
+                break
+            batch.append(item)
+        _commit_batch(batch)
+    # 종료 신호 이후에 남은 결과도 비운다
+    leftover = []
+    while True:
+        try:
+            item = _queue.get_nowait()
+        except queue.Empty:
+            break
+        if item is not _STOP:
+            leftover.append(item)
+    if leftover:
+        _commit_batch(leftover)
+    release_thread_db()
+
+
+def _ensure_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is None or not _writer.is_alive():
+            _writer = threading.Thread(target=_writer_loop, name="result-writer", daemon=True)
+            _writer.start()
+
+
+def flush(timeout=RESULT_WRITE_TIMEOUT):
+    """writer 스레드를 멈추고 큐에 남은 결과를 모두 커밋한다 (프로세스 종료 시 호출)"""
+    global _writer
+    with _writer_lock:
+        writer = _writer
+        _writer = None
+    if writer is None or not writer.is_alive():
+        return
+    _queue.put(_STOP)
+    writer.join(timeout)
+
+
+atexit.register(flush)
+
+
+def save_result(db, user_id, nickname, score, weak_tags, tag_misses, duration_seconds, difficulty, now):
+    """
+    설정된 모드로 결과를 저장한다. 저장에 실패했거나 커밋을 확인하지 못하면 False
+    (RESULT_DURABILITY=none 은 기다리지 않으므로 항상 True).
+    """
+    args = (user_id, nickname, score, weak_tags, tag_misses, duration_seconds, difficulty, now)
+    if RESULT_WRITE_MODE != "queue":
+        try:
+            record_result(db, *args)
+            db.commit()
+        except sqlite3.Error as e:
+            db.rollback()
+            print(f"[ERROR] 퀴즈 결과 저장 실패: {e}")
+            return False
+        return True
+
+    _ensure_writer()
+    pending = _PendingResult(args)
+    _queue.put(pending)
+    if RESULT_DURABILITY == "none":
+        return True
+    if not pending.done.wait(RESULT_WRITE_TIMEOUT):
+        print(f"[WARN] 퀴즈 결과 group commit 대기 시간 초과 ({RESULT_WRITE_TIMEOUT}s), 백그라운드에서 계속 저장")
+        return False
+    return pending.error is None
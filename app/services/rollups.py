@@ -0,0 +1,213 @@
+"""
+attempts 일별 집계와 보관.
+
+update_rollups() 는 워터마크(meta.attempt_rollup_watermark, 마지막으로 집계한 attempts.id) 이후의
+행만 읽어 일 x 난이도 집계 테이블에 더한다. 통계 화면/분석은 원본 attempts 대신 집계 테이블을 읽는다.
+태그별 오답 수는 attempts.tag_misses(태그별로 실제 틀린 문제 수)로 센다.
+
+archive_attempts() 는 이미 집계된 오래된 행을 (날짜, 난이도)별로 묶어 zlib 압축한 블록
+(attempts_archive_blocks) 으로 옮기고 attempts 에서 지운다. iter_archived_attempts() 로 다시 읽는다.
+"""
+import json
+import sqlite3
+import zlib
+from collections import Counter
+
+WATERMARK_KEY = "attempt_rollup_watermark"
+ROLLUP_BATCH_SIZE = 10000
+ARCHIVE_COMPRESS_LEVEL = 6
+
+
+def _get_watermark(db):
+    row = db.execute("SELECT value FROM meta WHERE key = ?", (WATERMARK_KEY,)).fetchone()
+    return int(row[0]) if row else 0
+
+
+def _set_watermark(db, attempt_id):
+    db.execute(
+        "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        (WATERMARK_KEY, str(attempt_id)),
+    )
+
+
+def _tag_miss_counts(weak_tags, tag_misses):
+    """{태그: 틀린 문제 수}. tag_misses 가 없는 예전 행은 실제 횟수를 몰라 상위 약점 태그마다 1로 센다"""
+    if tag_misses is not None:
+        return json.loads(tag_misses)
+    return {tag: 1 for tag in filter(None, weak_tags.split(","))}
+
+
+def _aggregate(rows):
+    daily, histogram, misses = {}, Counter(), Counter()
+    for _id, score, weak_tags, tag_misses, duration_seconds, difficulty, created_at in rows:
+        day = created_at[:10]
+        stat = daily.setdefault((day, difficulty), [0, 0, 0])
+        stat[0] += 1
+        stat[1] += score
+        stat[2] += duration_seconds
+        histogram[(day, difficulty, score)] += 1
+        for tag, count in _tag_miss_counts(weak_tags, tag_misses).items():
+            misses[(day, difficulty, tag)] += count
+    return daily, histogram, misses
+
+
+def _apply(db, daily, histogram, misses):
+    db.executemany(
+        """
+        INSERT INTO attempt_daily_stats (day, difficulty, attempts, score_sum, duration_sum)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(day, difficulty) DO UPDATE SET
+            attempts = attempts + excluded.attempts,
+            score_sum = score_sum + excluded.score_sum,
+            duration_sum = duration_sum + excluded.duration_sum
+        """,
+        [key + tuple(values) for key, values in daily.items()],
+    )
+    db.executemany(
+        """
+        INSERT INTO attempt_score_histogram (day, difficulty, score, attempts) VALUES (?, ?, ?, ?)
+        ON CONFLICT(day, difficulty, score) DO UPDATE SET attempts = attempts + excluded.attempts
+        """,
+        [key + (count,) for key, count in histogram.items()],
+    )
+    db.executemany(
+        """
+        INSERT INTO attempt_tag_misses (day, difficulty, concept_tag, misses) VALUES (?, ?, ?, ?)
+        ON CONFLICT(day, difficulty, concept_tag) DO UPDATE SET misses = misses + excluded.misses
+        """,
+        [key + (count,) for key, count in misses.items()],
+    )
+
+
+def update_rollups(db, batch_size=ROLLUP_BATCH_SIZE):
+    """워터마크 이후의 attempts 를 집계에 반영하고 반영한 행 수를 돌려준다"""
+    total = 0
+    while True:
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            watermark = _get_watermark(db)
+            rows = db.execute(
+                """
+                SELECT id, score, weak_tags, tag_misses, duration_seconds, difficulty, created_at
+                FROM attempts WHERE id > ? ORDER BY id LIMIT ?
+                """,
+                (watermark, batch_size),
+            ).fetchall()
+            if rows:
+                _apply(db, *_aggregate(rows))
+                _set_watermark(db, rows[-1][0])
+            db.commit()
+        except sqlite3.Error:
+            db.rollback()
+            raise
+        total += len(rows)
+        if len(rows) < batch_size:
+            return total
+
+
+def _pack(records):
+    return zlib.compress(
+        json.dumps(records, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+        ARCHIVE_COMPRESS_LEVEL,
+    )
+
+
+def archive_attempts(db, before, batch_size=ROLLUP_BATCH_SIZE):
+    """
+    created_at 이 before(YYYY-MM-DD) 이전이고 이미 집계된 attempts 를 압축 블록으로 옮긴다.
+    한 배치의 블록 저장과 원본 삭제는 같은 트랜잭션이라 중간에 멈춰도 중복/유실이 없다. 옮긴 행 수를 돌려준다.
+    """
+    update_rollups(db, batch_size)
+    moved = 0
+    while True:
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            watermark = _get_watermark(db)
+            rows = db.execute(
+                """
+                SELECT id, user_id, score, duration_seconds, created_at, weak_tags, tag_misses, difficulty
+                FROM attempts WHERE id <= ? AND created_at < ? ORDER BY id LIMIT ?
+                """,
+                (watermark, before, batch_size),
+            ).fetchall()
+            blocks = {}
+            for row in rows:
+                record = list(row[:6]) + [json.loads(row[6]) if row[6] is not None else None]
+                blocks.setdefault((row[4][:10], row[7]), []).append(record)
+            db.executemany(
+                """
+                INSERT INTO attempts_archive_blocks
+                    (day, difficulty, first_attempt_id, last_attempt_id, attempts, payload)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (day, difficulty, records[0][0], records[-1][0], len(records), _pack(records))
+                    for (day, difficulty), records in blocks.items()
+                ],
+            )
+            if rows:
+                # id 순으로 LIMIT 한 조회라 같은 조건에 id 상한만 걸면 읽은 행만 지워진다
+                db.execute(
+                    "DELETE FROM attempts WHERE id <= ? AND created_at < ?",
+                    (rows[-1][0], before),
+                )
+            db.commit()
+        except sqlite3.Error:
+            db.rollback()
+            raise
+        moved += len(rows)
+        if len(rows) < batch_size:
+            return moved
+
+
+def iter_archived_attempts(db, since, until, difficulty=None):
+    """since 이상 until 미만(YYYY-MM-DD) 날짜에 보관된 응시 기록을 dict 로 하나씩 돌려준다"""
+    sql = "SELECT payload FROM attempts_archive_blocks WHERE day >= ? AND day < ?"
+    params = [since, until]
+    if difficulty is not None:
+        sql += " AND difficulty = ?"
+        params.append(difficulty)
+    for (payload,) in db.execute(sql + " ORDER BY day, first_attempt_id", params).fetchall():
+        for attempt_id, user_id, score, duration_seconds, created_at, weak_tags, tag_misses in json.loads(
+            zlib.decompress(payload)
+        ):
+            yield {
+                "id": attempt_id,
+                "user_id": user_id,
+                "score": score,
+                "duration_seconds": duration_seconds,
+                "created_at": created_at,
+                "weak_tags": weak_tags,
+                "tag_misses": tag_misses,
+            }
+
+
+def daily_summary(db, since, difficulty=None):
+    """since(YYYY-MM-DD) 이후 일별 응시 수, 평균 점수/소요 시간 (집계 테이블만 읽음)"""
+    sql = """
+        SELECT day, difficulty, attempts,
+               ROUND(CAST(score_sum AS REAL) / attempts, 2) AS avg_score,
+               ROUND(CAST(duration_sum AS REAL) / attempts, 1) AS avg_duration_seconds
+        FROM attempt_daily_stats
+        WHERE day >= ?
+    """
+    params = [since]
+    if difficulty is not None:
+        sql += " AND difficulty = ?"
+        params.append(difficulty)
+    return db.execute(sql + " ORDER BY day, difficulty", params).fetchall()
+
+
+def top_missed_tags(db, since, limit=10):
+    """since 이후 틀린 문제 수가 많은 개념 태그 (집계 테이블만 읽음)"""
+    return db.execute(
+        """
+        SELECT concept_tag, SUM(misses) AS misses
+        FROM attempt_tag_misses
+        WHERE day >= ?
+        GROUP BY concept_tag
+        ORDER BY misses DESC
+        LIMIT ?
+        """,
+        (since, limit),
+    ).fetchall()
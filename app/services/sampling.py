@@ -0,0 +1,120 @@
+"""
+퀴즈 문제 추출.
+
+문제 은행 캐시가 (topic, difficulty) 별로 미리 만들어 둔 id 튜플에서 k 개를 뽑는다.
+전체 목록을 복사/셔플하지 않고 희소 Fisher-Yates(바꾼 자리만 dict 에 기록)로 O(k) 에 끝낸다.
+
+QUIZ_SAMPLING_STRATEGY 로 가중치를 줄 수 있다 (쉼표로 여러 개, 가중치는 곱한다).
+    uniform      : 가중치 없음 (기본)
+    tag_coverage : 이미 뽑힌 concept_tag 와 겹치는 문제는 TAG_REPEAT_WEIGHT 확률로만 채택
+    exposure     : 이 프로세스에서 최근 많이 출제된 문제일수록 덜 뽑힘
+가중치는 균등 추출한 후보를 weight(0~1) 확률로 채택하는 방식(rejection)이라 여전히 기대 O(k) 이다.
+
+QUIZ_SAMPLING_SEED 를 주면 같은 순서로 뽑혀 벤치마크를 재현할 수 있다.
+"""
+import os
+import random
+import threading
+from collections import OrderedDict
+
+from . import question_bank
+
+QUIZ_LENGTH = int(os.getenv("QUIZ_LENGTH", "8"))
+QUIZ_SAMPLING_STRATEGY = [
+    name.strip() for name in os.getenv("QUIZ_SAMPLING_STRATEGY", "uniform").split(",") if name.strip()
+]
+QUIZ_SAMPLING_SEED = os.getenv("QUIZ_SAMPLING_SEED")
+TAG_REPEAT_WEIGHT = float(os.getenv("QUIZ_TAG_REPEAT_WEIGHT", "0.25"))
+EXPOSURE_TRACK_SIZE = int(os.getenv("QUIZ_EXPOSURE_TRACK_SIZE", "50000"))
+# 후보 하나를 채택하기까지 최대 시도 횟수. 넘기면 가중치 없이 채운다
+MAX_REJECTIONS = 32
+
+_rng = random.Random(int(QUIZ_SAMPLING_SEED)) if QUIZ_SAMPLING_SEED is not None else random.Random()
+_exposure = OrderedDict()  # question id -> 출제 횟수 (LRU 로 크기 제한)
+_exposure_lock = threading.Lock()
+
+
+def reseed(seed=None):
+    """추출 난수 상태를 다시 정한다 (벤치마크/재현용)"""
+    _rng.seed(seed)
+
+
+def _tag_coverage_weight(question, chosen_tags):
+    if question is None or question.concept_tag not in chosen_tags:
+        return 1.0
+    return TAG_REPEAT_WEIGHT
+
+
+def _exposure_weight(question_id):
+    return 1.0 / (1 + _exposure.get(question_id, 0))
+
+
+def _record_exposure(question_ids):
+    with _exposure_lock:
+        for question_id in question_ids:
+            _exposure[question_id] = _exposure.pop(question_id, 0) + 1
+        while len(_exposure) > EXPOSURE_TRACK_SIZE:
+            _exposure.popitem(last=False)
+
+
+def sample_ids(ids, k, rng=None, weight=None):
+    """
+    ids 에서 서로 다른 k 개를 뽑는다. ids 는 수정하지 않는다.
+    weight(id, chosen) 가 있으면 후보를 그 확률(0~1)로 채택한다.
+    """
+    rng = rng or _rng
+    n = len(ids)
+    k = min(k, n)
+    swapped = {}
+    chosen = []
+    position = 0
+    while len(chosen) < k:
+        # 아직 뽑히지 않은 [position, n) 구간에서 하나를 꺼내 position 자리와 맞바꾼다
+        rejections = 0
+        while True:
+            j = rng.randrange(position, n)
+            candidate = swapped.get(j, ids[j])
+            if weight is None or rejections >= MAX_REJECTIONS or rng.random() < weight(candidate, chosen):
+                break
+            rejections += 1
+        swapped[j] = swapped.get(position, ids[position])
+        position += 1
+        chosen.append(candidate)
+    return chosen
+
+
+def _build_weight(db, strategy):
+    if not strategy or strategy == ["uniform"]:
+        return None
+    use_tags = "tag_coverage" in strategy
+    use_exposure = "exposure" in strategy
+    chosen_tags = set()
+    counted = [0]  # chosen 중 태그를 반영한 개수
+
+    def weight(question_id, chosen):
+        value = 1.0
+        if use_tags:
+            for chosen_id in chosen[counted[0]:]:
+                question = question_bank.get_question(db, chosen_id)
+                if question is not None:
+                    chosen_tags.add(question.concept_tag)
+            counted[0] = len(chosen)
+            value *= _tag_coverage_weight(question_bank.get_question(db, question_id), chosen_tags)
+        if use_exposure:
+            value *= _exposure_weight(question_id)
+        return value
+
+    return weight
+
+
+def sample_questions(db, topic, difficulty, k=QUIZ_LENGTH, strategy=None, seed=None):
+    """조건에 맞는 문제 id 를 k 개까지 뽑는다 (없으면 빈 리스트)"""
+    ids = question_bank.get_question_ids(db, topic, difficulty)
+    if not ids:
+        return []
+    strategy = QUIZ_SAMPLING_STRATEGY if strategy is None else strategy
+    rng = random.Random(seed) if seed is not None else None
+    chosen = sample_ids(ids, k, rng=rng, weight=_build_weight(db, strategy))
+    if "exposure" in strategy:
+        _record_exposure(chosen)
+    return chosen
@@ -0,0 +1,248 @@
+"""
+문제/영상 시드 데이터 대량 적재.
+
+JSON 배열이나 JSON Lines 파일을 통째로 메모리에 올리지 않고 스트리밍으로 읽어,
+content_key 로 기존 행과 대조한 뒤 executemany 로 배치 단위 트랜잭션에 넣는다.
+같은 파일을 다시 적재하면 바뀐 행만 UPDATE 되고 나머지는 unchanged 로 집계된다.
+"""
+import hashlib
+import json
+import re
+import time
+from contextlib import contextmanager
+from operator import itemgetter
+
+from .question_bank import bump_data_version
+
+QUESTION_FIELDS = (
+    "topic",
+    "question",
+    "choice_a",
+    "choice_b",
+    "choice_c",
+    "choice_d",
+    "correct",
+    "concept_tag",
+    "difficulty",
+)
+VIDEO_FIELDS = ("concept_tag", "youtube_url")
+
+DEFAULT_BATCH_SIZE = 5000
+# IN (...) 한 번에 넣는 키 수 (SQLite 변수 개수 제한 이하)
+KEY_LOOKUP_CHUNK = 500
+_READ_CHUNK = 1 << 16
+_WHITESPACE_RE = re.compile(r"\s*")
+
+
+_blake2b = hashlib.blake2b
+_decode_json = json.JSONDecoder().decode
+
+
+def _digest(parts):
+    return _blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def question_key(record):
+    """
+    문제의 안정 식별자. 원본에 key 가 있으면 그대로, 없으면 주제 + 난이도 + 문제 본문으로 만든다.
+    (본문이 같아도 난이도가 다르면 다른 문제로 본다. 키 규칙을 바꾸면 마이그레이션으로 기존 키도 다시 채울 것)
+    """
+    if record.get("key"):
+        return str(record["key"])
+    return _digest((
+        record["topic"].strip(),
+        record["difficulty"].strip(),
+        " ".join(record["question"].split()),
+    ))
+
+
+def video_key(record):
+    if record.get("key"):
+        return str(record["key"])
+    return _digest((record["concept_tag"].strip(), record["youtube_url"].strip()))
+
+
+def content_hash(values):
+    """저장되는 컬럼 값 튜플의 해시. 다시 적재할 때 바뀐 행을 골라내는 데 쓴다"""
+    return _digest(map(str, values))
+
+
+def iter_records(path):
+    """JSON 배열 또는 JSON Lines 파일을 한 레코드씩 읽는다"""
+    with open(path, "r", encoding="utf-8") as file:
+        head = file.read(_READ_CHUNK)
+        stripped = head.lstrip()
+        if not stripped.startswith("["):
+            yield from _iter_json_lines(head, file)
+            return
+        yield from _iter_json_array(stripped[1:], file)
+
+
+def _iter_json_lines(head, file):
+    buffer = head
+    while True:
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            if line and not line.isspace():
+                yield _decode_json(line)
+        chunk = file.read(_READ_CHUNK)
+        if not chunk:
+            break
+        buffer += chunk
+    if buffer.strip():
+        yield json.loads(buffer)
+
+
+def _iter_json_array(buffer, file):
+    """
+    '[' 다음부터 레코드(JSON 객체)를 하나씩 읽는다.
+    레코드 사이에는 쉼표가 정확히 하나 있어야 하고, 빠지거나 남으면(끝의 쉼표 포함) ValueError.
+    """
+    decoder = json.JSONDecoder()
+    pos = 0
+    count = 0
+    expect = "record_or_end"   # record_or_end -> (레코드) -> comma_or_end -> (쉼표) -> record -> ...
+    while True:
+        pos = _WHITESPACE_RE.match(buffer, pos).end()
+        if pos == len(buffer):
+            chunk = file.read(_READ_CHUNK)
+            if not chunk:
+                raise ValueError(f"JSON 배열이 ']' 로 끝나지 않았습니다 (레코드 {count}개 뒤)")
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+        char = buffer[pos]
+        if char == "]":
+            if expect == "record":
+                raise ValueError(f"레코드 {count}번 뒤의 ',' 다음에 레코드가 없습니다")
+            return
+        if expect == "comma_or_end":
+            if char != ",":
+                raise ValueError(f"레코드 {count}번 뒤에 ',' 가 없습니다: {buffer[pos:pos + 40]!r}")
+            pos += 1
+            expect = "record"
+            continue
+        if char == ",":
+            raise ValueError(f"레코드 {count}번 뒤에 ',' 가 두 번 이상 있습니다")
+        try:
+            record, pos = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # 레코드가 청크 경계에 걸렸으면 남은 부분만 두고 이어 읽는다
+            chunk = file.read(_READ_CHUNK)
+            if not chunk:
+                raise
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+        if not isinstance(record, dict):
+            raise ValueError(f"레코드 {count + 1}번이 JSON 객체가 아닙니다: {record!r}")
+        count += 1
+        expect = "comma_or_end"
+        yield record
+
+
+def _batched(records, size):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _existing_hashes(db, table, keys):
+    found = {}
+    for start in range(0, len(keys), KEY_LOOKUP_CHUNK):
+        chunk = keys[start:start + KEY_LOOKUP_CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        rows = db.execute(
+            f"SELECT content_key, content_hash FROM {table} WHERE content_key IN ({placeholders})",
+            chunk,
+        ).fetchall()
+        found.update((row[0], row[1]) for row in rows)
+    return found
+
+
+def bulk_upsert(db, table, records, fields, key_func, batch_size=DEFAULT_BATCH_SIZE):
+    """records 를 content_key 기준으로 넣거나 갱신하고 {inserted, updated, unchanged} 를 돌려준다"""
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+    columns = ", ".join(fields)
+    insert_sql = (
+        f"INSERT INTO {table} ({columns}, content_key, content_hash) "
+        f"VALUES ({', '.join('?' * (len(fields) + 2))})"
+    )
+    update_sql = (
+        f"UPDATE {table} SET {', '.join(f'{field} = ?' for field in fields)}, content_hash = ? "
+        "WHERE content_key = ?"
+    )
+
+    row_values = itemgetter(*fields)
+
+    for batch in _batched(records, batch_size):
+        # 같은 배치 안의 중복 키는 마지막 것만 남긴다
+        rows = {}
+        for record in batch:
+            values = row_values(record)
+            rows[key_func(record)] = (values, content_hash(values))
+        existing = _existing_hashes(db, table, list(rows))
+
+        inserts, updates = [], []
+        for key, (values, digest) in rows.items():
+            if key not in existing:
+                inserts.append(values + (key, digest))
+            elif existing[key] != digest:
+                updates.append(values + (digest, key))
+        counts["unchanged"] += len(rows) - len(inserts) - len(updates)
+
+        if inserts or updates:
+            try:
+                db.executemany(insert_sql, inserts)
+                db.executemany(update_sql, updates)
+                # 실행 중인 앱의 문제 은행 캐시가 다시 읽도록
+                bump_data_version(db)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+        counts["inserted"] += len(inserts)
+        counts["updated"] += len(updates)
+    return counts
+
+
+@contextmanager
+def bulk_load(db):
+    """
+    적재하는 동안 WAL 자동 체크포인트를 멈춘다. 배치 커밋마다 체크포인트가 돌면
+    같은 페이지를 여러 번 DB 파일로 옮기게 되므로, 끝난 뒤 한 번만 체크포인트한다.
+    """
+    previous = db.execute("PRAGMA wal_autocheckpoint").fetchone()[0]
+    db.execute("PRAGMA wal_autocheckpoint=0")
+    try:
+        yield db
+    finally:
+        db.execute(f"PRAGMA wal_autocheckpoint={int(previous)}")
+        db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def _normalize_question(record):
+    # 방금 파싱한 레코드라 복사하지 않고 그대로 채운다
+    record.setdefault("difficulty", "medium")
+    return record
+
+
+def seed_questions(db, path, batch_size=DEFAULT_BATCH_SIZE):
+    records = (_normalize_question(record) for record in iter_records(path))
+    return bulk_upsert(db, "questions", records, QUESTION_FIELDS, question_key, batch_size)
+
+
+def seed_videos(db, path, batch_size=DEFAULT_BATCH_SIZE):
+    return bulk_upsert(db, "concept_videos", iter_records(path), VIDEO_FIELDS, video_key, batch_size)
+
+
+def report(name, counts, started):
+    print(
+        f"[OK] {name}: inserted={counts['inserted']} updated={counts['updated']} "
+        f"unchanged={counts['unchanged']} ({time.perf_counter() - started:.2f}s)"
+    )
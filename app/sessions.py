@@ -0,0 +1,247 @@
+"""
+서버 측 세션.
+
+Flask 기본 세션은 퀴즈 진행 상태(q_ids, answers 등)를 통째로 서명된 쿠키에 실어 매 요청 주고받는다.
+서버 측 백엔드를 고르면 쿠키에 불투명한 세션 id 만 싣고 내용은 서버 저장소에 JSON 으로 둔다.
+
+SESSION_BACKEND
+    cookie (기본) : Flask 기본 쿠키 세션 (기존 동작)
+    sqlite        : sessions 테이블. 여러 워커 프로세스가 같은 세션을 본다
+    memory        : 프로세스 내 LRU. 워커가 하나일 때만 사용
+"""
+import json
+import os
+import random
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask.sessions import SecureCookieSessionInterface, SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+from . import db as app_db
+
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "cookie")
+SESSION_TTL = int(os.getenv("SESSION_TTL", str(60 * 60 * 2)))  # 마지막 저장 후 2시간
+SESSION_MEMORY_MAX = int(os.getenv("SESSION_MEMORY_MAX", "10000"))
+# sqlite 저장 시 만료 세션 정리를 돌릴 확률
+SESSION_EVICT_PROBABILITY = float(os.getenv("SESSION_EVICT_PROBABILITY", "0.01"))
+
+
+def _convert(value):
+    """JSON 으로 바로 못 쓰는 세션 값. 집합/튜플류는 리스트로, 나머지는 문자열로 바꾼다"""
+    print(f"[WARN] 세션 값({type(value).__name__})은 JSON 으로 저장할 수 없어 변환합니다")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+def encode(data):
+    """저장소에 넣을 세션 내용 (JSON 문자열). 변환할 수 없으면 TypeError/ValueError"""
+    return json.dumps(dict(data), ensure_ascii=False, separators=(",", ":"), default=_convert)
+
+
+class ServerSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, new=False):
+        def on_update(_self):
+            _self.modified = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+        self.previous_sid = None
+
+    def regenerate(self):
+        """
+        내용은 그대로 두고 세션 id 만 새로 발급한다 (세션 고정 공격 방지, 로그인 직후 호출).
+        예전 id 의 저장소 항목은 응답을 저장할 때 지운다.
+        """
+        if not self.new and self.previous_sid is None:
+            self.previous_sid = self.sid
+        self.sid = secrets.token_urlsafe(32)
+        self.new = True
+        self.modified = True
+
+
+class MemorySessionStore:
+    """
+    프로세스 내 LRU. 항목 수와 TTL 로 정리한다.
+    sqlite 와 같이 JSON 문자열로 보관하므로 요청마다 새 객체를 받는다 (중첩 리스트를 요청끼리 공유하지 않음).
+    """
+
+    def __init__(self, max_entries=SESSION_MEMORY_MAX):
+        self.max_entries = max_entries
+        self._items = OrderedDict()  # sid -> (expires_at, payload)
+        self._lock = threading.Lock()
+
+    def load(self, sid):
+        with self._lock:
+            item = self._items.get(sid)
+            if item is None:
+                return None
+            expires_at, payload = item
+            if expires_at < time.time():
+                del self._items[sid]
+                return None
+            self._items.move_to_end(sid)
+        return json.loads(payload)
+
+    def save(self, sid, payload, expires_at):
+        with self._lock:
+            self._items[sid] = (expires_at, payload)
+            self._items.move_to_end(sid)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def delete(self, sid):
+        with self._lock:
+            self._items.pop(sid, None)
+
+    def evict_expired(self):
+        now = time.time()
+        with self._lock:
+            for sid in [sid for sid, (expires_at, _payload) in self._items.items() if expires_at < now]:
+                del self._items[sid]
+
+
+class SqliteSessionStore:
+    """
+    sessions 테이블. 요청 처리용 연결(get_db)과 트랜잭션이 섞이지 않도록
+    스레드별로 별도 연결을 쓴다.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _db(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.path != app_db.DB_PATH:
+            conn = app_db.connect(app_db.DB_PATH)
+            self._local.conn = conn
+            self._local.path = app_db.DB_PATH
+        return conn
+
+    def load(self, sid):
+        try:
+            row = self._db().execute(
+                "SELECT data FROM sessions WHERE id = ? AND expires_at >= ?",
+                (sid, time.time()),
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"[WARN] 세션 조회 실패: {e}")
+            return None
+        return json.loads(row[0]) if row else None
+
+    def save(self, sid, payload, expires_at):
+        db = self._db()
+        try:
+            db.execute(
+                """
+                INSERT INTO sessions (id, data, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET data = excluded.data, expires_at = excluded.expires_at
+                """,
+                (sid, payload, expires_at),
+            )
+            if random.random() < SESSION_EVICT_PROBABILITY:
+                db.execute("DELETE FROM sessions WHERE expires_at < ?", (time.time(),))
+            db.commit()
+        except sqlite3.Error as e:
+            db.rollback()
+            print(f"[WARN] 세션 저장 실패: {e}")
+
+    def delete(self, sid):
+        db = self._db()
+        try:
+            db.execute("DELETE FROM sessions WHERE id = ?", (sid,))
+            db.commit()
+        except sqlite3.Error as e:
+            db.rollback()
+            print(f"[WARN] 세션 삭제 실패: {e}")
+
+    def evict_expired(self):
+        db = self._db()
+        db.execute("DELETE FROM sessions WHERE expires_at < ?", (time.time(),))
+        db.commit()
+
+
+class ServerSideSessionInterface(SessionInterface):
+    def __init__(self, store, ttl=SESSION_TTL):
+        self.store = store
+        self.ttl = ttl
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            data = self.store.load(sid)
+            if data is not None:
+                return ServerSession(data, sid=sid)
+        return ServerSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if session.previous_sid is not None:
+            self.store.delete(session.previous_sid)
+            session.previous_sid = None
+
+        if not session:
+            # 비워진 세션(퀴즈 종료 등)은 저장소와 쿠키 모두 지운다
+            if not session.new:
+                self.store.delete(session.sid)
+            if session.modified and not session.new:
+                response.delete_cookie(
+                    name,
+                    domain=domain,
+                    path=path,
+                    secure=self.get_cookie_secure(app),
+                    samesite=self.get_cookie_samesite(app),
+                    httponly=self.get_cookie_httponly(app),
+                )
+            return
+
+        if not session.modified:
+            return
+        try:
+            payload = encode(session)
+        except (TypeError, ValueError) as e:
+            # 응답은 그대로 보내고 이번 변경만 저장하지 않는다 (500 대신)
+            print(f"[WARN] 세션 저장 건너뜀 (JSON 변환 실패): {e}")
+            return
+        self.store.save(session.sid, payload, time.time() + self.ttl)
+        if session.new or session.permanent:
+            response.set_cookie(
+                name,
+                session.sid,
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=domain,
+                path=path,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app),
+            )
+
+
+def regenerate(session):
+    """
+    서버 측 세션이면 세션 id 를 새로 발급한다.
+    cookie 백엔드는 서버에 세션 id 가 없어(내용 자체가 서명된 쿠키) 할 일이 없다.
+    """
+    if isinstance(session, ServerSession):
+        session.regenerate()
+
+
+def create_session_interface(backend=SESSION_BACKEND):
+    if backend == "memory":
+        return ServerSideSessionInterface(MemorySessionStore())
+    if backend == "sqlite":
+        return ServerSideSessionInterface(SqliteSessionStore())
+    return SecureCookieSessionInterface()
+
+
+def init_app(app):
+    app.session_interface = create_session_interface()
@@ -0,0 +1,156 @@
+// 한 페이지 퀴즈: /quiz/api/start 로 문제 전체를 받고, 답안은 /quiz/api/submit 로 한 번에 제출한다.
+const startForm = document.getElementById("spaStartForm");
+const quizCard = document.getElementById("spaQuiz");
+const answerForm = document.getElementById("spaAnswerForm");
+const choicesEl = document.getElementById("spaChoices");
+const prevButton = document.getElementById("spaPrev");
+const nextButton = document.getElementById("spaNext");
+const errorCard = document.getElementById("spaError");
+
+const state = { questions: [], answers: [], index: 0 };
+
+function showError(message) {
+  errorCard.querySelector(".error").textContent = message || "";
+  errorCard.hidden = !message;
+}
+
+async function postJson(url, body) {
+  const response = await fetch(url, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    credentials: "same-origin",
+    body: JSON.stringify(body)
+  });
+  const data = await response.json().catch(() => ({}));
+  if (!response.ok) {
+    throw new Error(data.error || "요청을 처리하지 못했습니다.");
+  }
+  return data;
+}
+
+function renderQuestion() {
+  const total = state.questions.length;
+  const question = state.questions[state.index];
+  document.getElementById("spaNumber").textContent = `문제 ${state.index + 1} / ${total}`;
+  document.getElementById("spaProgress").style.width = `${((state.index + 1) / total) * 100}%`;
+  document.getElementById("spaQuestion").textContent = question.question;
+
+  choicesEl.replaceChildren();
+  question.choices.forEach((choice) => {
+    const label = document.createElement("label");
+    label.className = "option";
+    const input = document.createElement("input");
+    input.type = "radio";
+    input.name = "answer";
+    input.value = choice.key;
+    input.required = true;
+    input.checked = state.answers[state.index] === choice.key;
+    const text = document.createElement("span");
+    text.textContent = choice.text;
+    label.append(input, text);
+    choicesEl.appendChild(label);
+  });
+
+  prevButton.hidden = state.index === 0;
+  nextButton.textContent = state.index === total - 1 ? "제출" : "다음";
+}
+
+function renderResult(result) {
+  quizCard.hidden = true;
+  document.getElementById("spaResult").hidden = false;
+  document.getElementById("spaResultNickname").textContent = result.nickname;
+  document.getElementById("spaResultScore").textContent = `${result.score} / ${result.total}`;
+  const rate = result.total ? Math.floor((result.score / result.total) * 100) : 0;
+  document.getElementById("spaResultRate").textContent = `정답률: ${rate}%`;
+
+  const tagsCard = document.getElementById("spaWeakTags");
+  const tagsEl = tagsCard.querySelector("div");
+  result.weak_tags.forEach((tag) => {
+    const span = document.createElement("span");
+    span.className = "tag";
+    span.textContent = tag;
+    tagsEl.appendChild(span);
+  });
+  tagsCard.hidden = result.weak_tags.length === 0;
+
+  const videosCard = document.getElementById("spaVideos");
+  const videosEl = videosCard.querySelector("div");
+  result.videos.forEach((video) => {
+    const box = document.createElement("div");
+    box.style.cssText = "background: #111; border: 1px solid #2a2a2a; border-radius: 12px; padding: 12px;";
+    const title = document.createElement("div");
+    title.style.cssText = "color: #fbbf24; font-weight: 700; margin-bottom: 8px;";
+    title.textContent = `${video.tag} 개념 학습`;
+    box.appendChild(title);
+    if (video.embed_url) {
+      const frameWrap = document.createElement("div");
+      frameWrap.style.cssText = "position: relative; padding-top: 56.25%; border-radius: 10px; overflow: hidden; background: #000;";
+      const frame = document.createElement("iframe");
+      frame.src = video.embed_url;
+      frame.title = `${video.tag} 영상`;
+      frame.style.cssText = "position: absolute; top: 0; left: 0; width: 100%; height: 100%; border: 0;";
+      frame.allow = "accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture";
+      frame.allowFullscreen = true;
+      frameWrap.appendChild(frame);
+      box.appendChild(frameWrap);
+    }
+    const link = document.createElement("a");
+    link.href = video.url;
+    link.target = "_blank";
+    link.className = "video-link";
+    link.textContent = "유튜브에서 보기 →";
+    box.appendChild(link);
+    videosEl.appendChild(box);
+  });
+  videosCard.hidden = result.videos.length === 0;
+}
+
+startForm.addEventListener("submit", async (event) => {
+  event.preventDefault();
+  showError("");
+  const data = new FormData(startForm);
+  try {
+    const quiz = await postJson("/quiz/api/start", {
+      nickname: data.get("nickname"),
+      topic: data.get("topic"),
+      difficulty: data.get("difficulty")
+    });
+    state.questions = quiz.questions;
+    state.answers = new Array(quiz.questions.length).fill("");
+    state.index = 0;
+    document.getElementById("spaNotice").hidden = !quiz.nickname_exists;
+    startForm.hidden = true;
+    document.getElementById("spaLinks").hidden = true;
+    quizCard.hidden = false;
+    renderQuestion();
+  } catch (error) {
+    showError(error.message);
+  }
+});
+
+prevButton.addEventListener("click", () => {
+  if (state.index > 0) {
+    state.index -= 1;
+    renderQuestion();
+  }
+});
+
+answerForm.addEventListener("submit", async (event) => {
+  event.preventDefault();
+  const selected = answerForm.querySelector("input[name=answer]:checked");
+  state.answers[state.index] = selected ? selected.value : "";
+  if (state.index < state.questions.length - 1) {
+    state.index += 1;
+    renderQuestion();
+    return;
+  }
+  nextButton.disabled = true;
+  try {
+    const result = await postJson("/quiz/api/submit", { answers: state.answers });
+    renderResult(result);
+    showError(result.save_error);
+  } catch (error) {
+    showError(error.message);
+    nextButton.disabled = false;
+  }
+});
@@ -0,0 +1,58 @@
+"""
+attempts 일별 집계 갱신 + 오래된 attempts 보관.
+
+cron 등으로 주기적으로 실행한다. 집계는 워터마크 이후 행만 읽으므로 자주 돌려도 가볍다.
+
+    python3 scripts/archive_attempts.py                      # 집계 갱신 + 90일 지난 행 보관
+    python3 scripts/archive_attempts.py --rollup-only
+    python3 scripts/archive_attempts.py --older-than-days 30 --report-days 7
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+from app.db import connect
+from app.migrations import migrate
+from app.services import rollups
+
+
+def main():
+    parser = argparse.ArgumentParser(description="attempts 집계/보관")
+    parser.add_argument("--older-than-days", type=int, default=90, help="이 일수보다 오래된 attempts 를 보관")
+    parser.add_argument("--rollup-only", action="store_true", help="집계만 갱신하고 보관은 하지 않음")
+    parser.add_argument("--batch-size", type=int, default=rollups.ROLLUP_BATCH_SIZE)
+    parser.add_argument("--report-days", type=int, default=0, help="최근 N일 집계를 출력")
+    args = parser.parse_args()
+
+    db = connect()
+    migrate(db)
+
+    started = time.perf_counter()
+    rolled = rollups.update_rollups(db, args.batch_size)
+    print(f"[OK] 집계 반영: {rolled}건 ({time.perf_counter() - started:.2f}s)")
+
+    if not args.rollup_only:
+        before = (date.today() - timedelta(days=args.older_than_days)).isoformat()
+        started = time.perf_counter()
+        moved = rollups.archive_attempts(db, before, args.batch_size)
+        print(f"[OK] {before} 이전 attempts 보관: {moved}건 ({time.perf_counter() - started:.2f}s)")
+
+    if args.report_days:
+        since = (date.today() - timedelta(days=args.report_days)).isoformat()
+        for row in rollups.daily_summary(db, since):
+            print(
+                f"{row['day']} {row['difficulty'] or '-':<8} attempts={row['attempts']} "
+                f"avg_score={row['avg_score']} avg_duration={row['avg_duration_seconds']}s"
+            )
+        tags = ", ".join(f"{row['concept_tag']}({row['misses']})" for row in rollups.top_missed_tags(db, since))
+        print(f"약점 태그 TOP: {tags or '-'}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+뉴스 파이프라인 오프라인 벤치마크.
+
+로컬 스텁 서버(news_stub_server.py)를 띄우고 임시 디렉터리의 캐시/DB로
+cold / warm / llm-warm / partial-failure 시나리오를 돌려 소요 시간과 호출 수를 측정한다.
+실제 HackerNews, OpenAI 에는 요청하지 않는다.
+
+    python3 scripts/bench_news.py --latency-ms 120 --output bench_news.jsonl
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from openai import OpenAI
+
+from app import db as app_db
+from app.main import create_app
+from app.services import http_client, llm_cache, news
+from news_stub_server import load_fixture, start_in_thread
+
+SCENARIOS = ["cold", "warm", "llm-warm", "partial-failure"]
+
+
+def _isolate(work_dir: Path, base_url: str):
+    """뉴스 캐시, 이미지, DB를 임시 디렉터리로 돌리고 외부 API 대신 스텁을 보게 한다"""
+    news.CACHE_FILE = work_dir / "news_cache.json"
+    news.LOCK_FILE = work_dir / "news_cache.lock"
+    news.GENERATED_DIR = work_dir / "generated"
+    news.GENERATED_DIR.mkdir(exist_ok=True)
+    news.HN_TOP_STORIES_URL = f"{base_url}/v0/topstories.json"
+    news.HN_ITEM_URL = base_url + "/v0/item/{}.json"
+    news.NEWS_SOURCES_ENABLED = ["HackerNews"]
+    news.client = OpenAI(base_url=f"{base_url}/v1", api_key="stub")
+
+    app_db.DB_PATH = str(work_dir / "bench.db")
+    create_app()  # 임시 DB에 스키마 생성
+
+
+def _reset_news_cache(keep_llm_cache=True):
+    for key in ("data", "timestamp", "file_signature", "file_checked_at", "last_refresh_failure"):
+        news._news_cache[key] = None
+    news._news_cache["index"] = {}
+    news.CACHE_FILE.unlink(missing_ok=True)
+    if not keep_llm_cache:
+        llm_cache.evict(max_age=-1)
+        for path in news.GENERATED_DIR.iterdir():
+            path.unlink()
+
+
+def _run(name, server, repeat):
+    server.state.reset()
+    news._reset_llm_stats()
+    started = time.perf_counter()
+    items = []
+    for _ in range(repeat):
+        items = news.get_tech_news()
+    wall = time.perf_counter() - started
+    return {
+        "scenario": name,
+        "wall_seconds": round(wall, 4),
+        "per_call_ms": round(wall / repeat * 1000, 3),
+        "items": len(items),
+        "fallback": any(str(item.get("id", "")).startswith("fallback_") for item in items),
+        "stub": server.state.stats(),
+        "llm": news.get_llm_stats(),
+        "http": http_client.get_stats(),
+    }
+
+
+def run_scenario(name, server, error_rate, warm_repeat):
+    server.state.error_rate = 0.0
+    if name == "cold":
+        _reset_news_cache(keep_llm_cache=False)
+        return _run(name, server, 1)
+    if name == "warm":
+        if news._news_cache["data"] is None:
+            news.get_tech_news()
+        return _run(name, server, warm_repeat)
+    if name == "llm-warm":
+        # 뉴스 캐시는 비었지만 요약/이미지는 이전 갱신 결과가 남아 있는 상태
+        if news._news_cache["data"] is None:
+            news.get_tech_news()
+        _reset_news_cache(keep_llm_cache=True)
+        return _run(name, server, 1)
+    if name == "partial-failure":
+        _reset_news_cache(keep_llm_cache=False)
+        server.state.error_rate = error_rate
+        try:
+            return _run(name, server, 1)
+        finally:
+            server.state.error_rate = 0.0
+    raise ValueError(f"unknown scenario: {name}")
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="뉴스 파이프라인 오프라인 벤치마크")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="기본값: 전체")
+    parser.add_argument("--fixture", help="녹화된 응답 JSON (없으면 합성 데이터)")
+    parser.add_argument("--latency-ms", type=float, default=100)
+    parser.add_argument("--jitter-ms", type=float, default=20)
+    parser.add_argument("--error-rate", type=float, default=0.2, help="partial-failure 시나리오의 오류율")
+    parser.add_argument("--warm-repeat", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="결과를 JSON Lines 로 덧붙일 파일 (릴리스별 추적용)")
+    args = parser.parse_args()
+
+    server, base_url = start_in_thread(
+        fixture=load_fixture(args.fixture),
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        seed=args.seed,
+    )
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench_news_") as tmp:
+        _isolate(Path(tmp), base_url)
+        for name in args.scenario or SCENARIOS:
+            result = run_scenario(name, server, args.error_rate, args.warm_repeat)
+            results.append(result)
+            calls = result["stub"]["calls"]
+            print(
+                f"[BENCH] {name:<16} wall={result['wall_seconds']:.3f}s per_call={result['per_call_ms']:.3f}ms "
+                f"items={result['items']} fallback={result['fallback']} "
+                f"hn={calls.get('hn.item', 0) + calls.get('hn.topstories', 0)} "
+                f"chat={calls.get('openai.chat', 0)} images={calls.get('openai.images', 0)} "
+                f"errors={sum(result['stub']['errors'].values())} tokens={result['llm']['total_tokens']}"
+            )
+    server.shutdown()
+
+    if args.output:
+        record = {
+            "timestamp": time.time(),
+            "revision": _git_revision(),
+            "config": {
+                "latency_ms": args.latency_ms,
+                "jitter_ms": args.jitter_ms,
+                "error_rate": args.error_rate,
+                "fixture": args.fixture,
+                "llm_batch": news.NEWS_LLM_BATCH,
+            },
+            "results": results,
+        }
+        with open(args.output, "a", encoding="utf-8") as file:
+            file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        print(f"[OK] results appended to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
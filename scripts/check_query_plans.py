@@ -0,0 +1,162 @@
+"""
+app/routes/*.py (와 라우트에서 쓰는 서비스/세션 모듈)의 모든 SQL 에 대해 EXPLAIN QUERY PLAN 을 찍고,
+인덱스 없이 테이블 전체를 훑거나(SCAN <table>) 정렬용 임시 B-tree 를 쓰면 실패한다.
+인덱스(app/migrations)나 쿼리를 바꾼 뒤 회귀 확인용으로 실행한다.
+
+f-string SQL 은 모듈 상수로 채울 수 있는 자리는 채우고, 지역 변수에 달린 자리는 ? 로 바꿔 검사한다.
+변수에 담아 넘기는 등 읽을 수 없는 SQL 은 [WARN] 으로 알리고, --strict 면 실패로 센다.
+
+    python3 scripts/check_query_plans.py            # 실패가 있으면 종료 코드 1
+    python3 scripts/check_query_plans.py --verbose  # 모든 쿼리의 실행 계획 출력
+    python3 scripts/check_query_plans.py --strict   # 검사하지 못한 SQL 도 실패로 처리
+"""
+import argparse
+import ast
+import builtins
+import glob
+import importlib
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+from app.db import connect
+from app.migrations import migrate
+
+ROUTES_GLOB = os.path.join(BASE_DIR, "app", "routes", "*.py")
+# 라우트가 호출하는 SQL 이 들어 있는 모듈 (문제 은행, 문제 추출, 결과 저장, 세션 저장소)
+EXTRA_QUERY_FILES = [
+    os.path.join(BASE_DIR, "app", "services", "question_bank.py"),
+    os.path.join(BASE_DIR, "app", "services", "sampling.py"),
+    os.path.join(BASE_DIR, "app", "services", "results.py"),
+    os.path.join(BASE_DIR, "app", "sessions.py"),
+]
+
+# 의도적으로 전체를 읽는 쿼리 (파일명, SQL 일부)
+ALLOWED_FULL_SCANS = [
+    # 문제 은행 캐시는 데이터 버전이 바뀔 때만 전체를 한 번 읽는다
+    ("question_bank.py", "FROM questions ORDER BY id"),
+    ("question_bank.py", "FROM concept_videos ORDER BY id"),
+]
+
+_BAD_PLAN_RE = re.compile(r"^SCAN \w+$|USE TEMP B-TREE")
+
+
+def _module_namespace(path):
+    """f-string 자리를 채울 모듈 전역 이름들 (import 할 수 없으면 빈 dict)"""
+    module_name = os.path.splitext(os.path.relpath(path, BASE_DIR))[0].replace(os.sep, ".")
+    try:
+        return vars(importlib.import_module(module_name))
+    except Exception as e:
+        print(f"[WARN] {module_name} import 실패, f-string 자리는 ? 로 검사합니다: {e}")
+        return {}
+
+
+def _render_fstring(node, namespace):
+    """모듈 상수만 쓰는 자리는 값으로, 나머지(지역 변수 등)는 ? 로 채운 SQL"""
+    parts = []
+    for value in node.values:
+        if isinstance(value, ast.Constant):
+            parts.append(str(value.value))
+            continue
+        names = {name.id for name in ast.walk(value.value) if isinstance(name, ast.Name)}
+        if names and all(name in namespace or hasattr(builtins, name) for name in names):
+            parts.append(str(eval(compile(ast.Expression(value.value), "<sql>", "eval"), dict(namespace))))
+        else:
+            parts.append("?")
+    return "".join(parts)
+
+
+def extract_queries(path):
+    """
+    db.execute(...) 호출의 SQL 을 (줄 번호, SQL) 로 수집한다.
+    리터럴이 아니어서 읽지 못한 SQL 은 SQL 자리에 None 을 넣는다.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        tree = ast.parse(file.read(), filename=path)
+    namespace = None
+    queries = []
+    for node in ast.walk(tree):
+        if not (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and node.func.attr in ("execute", "executemany")
+            and node.args
+        ):
+            continue
+        arg = node.args[0]
+        if isinstance(arg, ast.Constant) and isinstance(arg.value, str):
+            sql = arg.value
+        elif isinstance(arg, ast.JoinedStr):
+            if namespace is None:
+                namespace = _module_namespace(path)
+            sql = _render_fstring(arg, namespace)
+        else:
+            sql = None
+        queries.append((node.lineno, " ".join(sql.split()) if sql is not None else None))
+    return sorted(queries, key=lambda query: query[0])
+
+
+def explain(db, sql):
+    params = (None,) * sql.count("?")
+    return [row["detail"] for row in db.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()]
+
+
+def _is_allowed(filename, sql):
+    return any(filename == name and fragment in sql for name, fragment in ALLOWED_FULL_SCANS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="라우트 SQL 실행 계획 검사")
+    parser.add_argument("--verbose", action="store_true")
+    parser.add_argument("--strict", action="store_true", help="검사하지 못한 SQL 도 실패로 처리")
+    args = parser.parse_args()
+
+    failures = 0
+    unchecked = 0
+    total = 0
+    with tempfile.TemporaryDirectory(prefix="query_plans_") as tmp:
+        db = connect(os.path.join(tmp, "plans.db"))
+        migrate(db)
+        for path in sorted(glob.glob(ROUTES_GLOB)) + EXTRA_QUERY_FILES:
+            filename = os.path.basename(path)
+            for lineno, sql in extract_queries(path):
+                total += 1
+                if sql is None:
+                    unchecked += 1
+                    print(f"[WARN] {filename}:{lineno} 리터럴/f-string 이 아닌 SQL 은 검사하지 못했습니다")
+                    continue
+                try:
+                    plan = explain(db, sql)
+                except sqlite3.Error as e:
+                    print(f"[FAIL] {filename}:{lineno} 실행 계획 실패: {e}\n       {sql}")
+                    failures += 1
+                    continue
+                bad = [detail for detail in plan if _BAD_PLAN_RE.search(detail)]
+                if bad and not _is_allowed(filename, sql):
+                    failures += 1
+                    print(f"[FAIL] {filename}:{lineno} {sql}")
+                    for detail in plan:
+                        print(f"       {detail}")
+                elif args.verbose:
+                    print(f"[OK] {filename}:{lineno} {sql}")
+                    for detail in plan:
+                        print(f"       {detail}")
+        db.close()
+
+    if failures:
+        print(f"[FAIL] {failures}/{total} 쿼리가 전체 스캔 또는 임시 정렬을 사용합니다")
+        sys.exit(1)
+    if unchecked:
+        print(f"[{'FAIL' if args.strict else 'WARN'}] {unchecked}/{total} 쿼리는 검사하지 못했습니다")
+        if args.strict:
+            sys.exit(1)
+    print(f"[OK] 검사한 {total - unchecked}개 쿼리 모두 인덱스를 사용합니다")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""
+HackerNews Firebase API + OpenAI 호환 API 로컬 스텁 서버.
+
+오프라인에서 뉴스 파이프라인을 벤치마크/회귀 테스트하기 위한 용도이며,
+record_news_fixture.py 로 녹화한 응답을 재생하거나 합성 데이터를 돌려준다.
+지연 시간과 오류율을 주입할 수 있다.
+
+    python3 scripts/news_stub_server.py --port 8765 --latency-ms 150 --error-rate 0.1
+    HN_API_BASE=http://127.0.0.1:8765/v0 OPENAI_BASE_URL=http://127.0.0.1:8765/v1 \
+        OPENAI_API_KEY=stub python3 scripts/warm_news_cache.py
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 1x1 PNG (이미지 생성 응답용)
+STUB_PNG_BASE64 = (
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8z8BQDwAEhQGAhKmMIQAAAABJRU5ErkJggg=="
+)
+
+
+def synthetic_fixture(count=60, now=None):
+    """녹화본이 없을 때 쓰는 합성 HackerNews 데이터"""
+    now = now or time.time()
+    topics = ["AI agents", "Kubernetes", "Rust", "Postgres", "WebAssembly", "Docker", "LLM inference", "Security"]
+    items = {}
+    for n in range(count):
+        story_id = 40000000 + n
+        items[str(story_id)] = {
+            "id": story_id,
+            "type": "story",
+            "by": f"user{n}",
+            "time": int(now - n * 600),
+            "title": f"{topics[n % len(topics)]} report #{n}: what changed in release {n // len(topics) + 1}",
+            "url": f"https://example.com/{topics[n % len(topics)].lower().replace(' ', '-')}/{n}",
+            "score": 500 - n * 7,
+        }
+    return {
+        "recorded_at": None,
+        "topstories": [int(story_id) for story_id in items],
+        "items": items,
+        "completions": {},
+    }
+
+
+def load_fixture(path):
+    if not path:
+        return synthetic_fixture()
+    with open(path, "r", encoding="utf-8") as file:
+        fixture = json.load(file)
+    fixture.setdefault("completions", {})
+    # 녹화 시점과 상관없이 72시간 필터를 통과하도록 가장 최근 글을 현재 시각에 맞춘다
+    times = [item.get("time", 0) for item in fixture["items"].values() if item]
+    if times:
+        offset = int(time.time()) - max(times)
+        for item in fixture["items"].values():
+            if item and "time" in item:
+                item["time"] += offset
+    return fixture
+
+
+def _synthetic_completion(title):
+    return (
+        f"HEADLINE: 🚀 {title} 요약\n"
+        f"SUMMARY: {title} 에 대한 스텁 요약입니다. 벤치마크용으로 생성된 문장입니다.\n"
+    )
+
+
+def _synthetic_detail(title):
+    return (
+        f"SUMMARY: {title} 스텁 상세\n\n"
+        "## 🎯 핵심 포인트\n- 스텁 포인트\n\n"
+        "## 💡 왜 지금 주목해야 하나\n- 스텁 이유\n\n"
+        "## 🔥 실무 적용 팁\n- 스텁 팁\n"
+    )
+
+
+class StubState:
+    def __init__(self, fixture, latency_ms=0, jitter_ms=0, error_rate=0.0, seed=None):
+        self.fixture = fixture
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.errors = {}
+        # 녹화된 GPT 응답은 원문 제목으로 찾는다
+        self.completions_by_title = {
+            fixture["items"][story_id]["title"]: content
+            for story_id, content in fixture["completions"].items()
+            if story_id in fixture["items"]
+        }
+
+    def count(self, endpoint, error=False):
+        with self.lock:
+            self.calls[endpoint] = self.calls.get(endpoint, 0) + 1
+            if error:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def should_fail(self):
+        with self.lock:
+            return self.random.random() < self.error_rate
+
+    def delay(self):
+        with self.lock:
+            jitter = self.random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+        seconds = max(0, self.latency_ms + jitter) / 1000
+        if seconds:
+            time.sleep(seconds)
+
+    def completion_for(self, title):
+        """헤드라인+요약 응답. 예전 녹화본에 DETAIL 이 있으면 잘라낸다"""
+        recorded = self.completions_by_title.get(title)
+        if recorded:
+            return recorded.split("\nDETAIL:", 1)[0].strip() + "\n"
+        return _synthetic_completion(title)
+
+    def detail_for(self, title):
+        """상세(DETAIL) 응답. 녹화본에 DETAIL 이 있으면 그것을 쓴다"""
+        recorded = self.completions_by_title.get(title) or ""
+        if "\nDETAIL:" in recorded:
+            return recorded.split("\nDETAIL:", 1)[1].strip() + "\n"
+        return _synthetic_detail(title)
+
+    def stats(self):
+        with self.lock:
+            return {"calls": dict(self.calls), "errors": dict(self.errors)}
+
+    def reset(self):
+        with self.lock:
+            self.calls.clear()
+            self.errors.clear()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state = None  # make_server 에서 주입
+
+    def log_message(self, *_args):
+        pass
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length).decode("utf-8"))
+
+    def _inject(self, endpoint):
+        """지연 주입 후, 오류를 주입했으면 True"""
+        self.state.delay()
+        if self.state.should_fail():
+            self.state.count(endpoint, error=True)
+            self._send_json({"error": {"message": "injected failure"}}, status=503)
+            return True
+        self.state.count(endpoint)
+        return False
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/__stats":
+            self._send_json(self.state.stats())
+            return
+        if path == "/v0/topstories.json":
+            if not self._inject("hn.topstories"):
+                self._send_json(self.state.fixture["topstories"])
+            return
+        match = re.match(r"^/v0/item/(\d+)\.json$", path)
+        if match:
+            if not self._inject("hn.item"):
+                self._send_json(self.state.fixture["items"].get(match.group(1)))
+            return
+        self._send_json({"error": "not found"}, status=404)
+
+    def do_POST(self):
+        path = self.path.split("?", 1)[0]
+        payload = self._read_json()
+        if path == "/v1/chat/completions":
+            if not self._inject("openai.chat"):
+                if payload.get("stream"):
+                    include_usage = bool((payload.get("stream_options") or {}).get("include_usage"))
+                    self._send_chat_stream(self._chat_response(payload), include_usage=include_usage)
+                else:
+                    self._send_json(self._chat_response(payload))
+            return
+        if path == "/v1/images/generations":
+            if not self._inject("openai.images"):
+                self._send_json({"created": int(time.time()), "data": [{"b64_json": STUB_PNG_BASE64}]})
+            return
+        self._send_json({"error": "not found"}, status=404)
+
+    def _send_chat_stream(self, response, chunk_size=16, include_usage=False):
+        """
+        chat completion 을 OpenAI 스트리밍(SSE) 형식으로 잘라서 보낸다.
+        include_usage 면 OpenAI 처럼 choices 가 빈 마지막 청크에 usage 를 실어 보낸다.
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        content = response["choices"][0]["message"]["content"]
+        starts = list(range(0, len(content), chunk_size))
+        chunks = [
+            [{
+                "index": 0,
+                "delta": {"content": content[start:start + chunk_size]},
+                "finish_reason": response["choices"][0]["finish_reason"] if start == starts[-1] else None,
+            }]
+            for start in starts
+        ]
+        if include_usage:
+            chunks.append([])
+        for choices in chunks:
+            chunk = {
+                "id": response["id"],
+                "object": "chat.completion.chunk",
+                "created": response["created"],
+                "model": response["model"],
+                "choices": choices,
+            }
+            if include_usage:
+                chunk["usage"] = response["usage"] if not choices else None
+            self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+    def _chat_response(self, payload):
+        messages = payload.get("messages") or []
+        system_text = " ".join(m.get("content", "") for m in messages if m.get("role") == "system")
+        user_text = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+        titles = re.findall(r"원문 제목:\n(.+)", user_text)
+        if "## 상세 내용 구조" in system_text:
+            content = self.state.detail_for(titles[0] if titles else "stub")
+        elif "[ITEM 1]" in user_text:
+            content = "\n".join(
+                f"=== ITEM {n} ===\n{self.state.completion_for(title)}" for n, title in enumerate(titles, start=1)
+            )
+        else:
+            content = self.state.completion_for(titles[0] if titles else "stub")
+        # 토큰 수는 대략 글자 수 / 4 로 흉내낸다
+        prompt_tokens = (len(system_text) + len(user_text)) // 4
+        completion_tokens = len(content) // 4
+        return {
+            "id": f"chatcmpl-stub-{int(time.time() * 1000)}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+
+def make_server(host="127.0.0.1", port=0, fixture=None, latency_ms=0, jitter_ms=0, error_rate=0.0, seed=None):
+    state = StubState(fixture or synthetic_fixture(), latency_ms, jitter_ms, error_rate, seed)
+    handler = type("BoundStubHandler", (StubHandler,), {"state": state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.state = state
+    return server
+
+
+def start_in_thread(**kwargs):
+    """벤치마크 스크립트에서 쓰는 백그라운드 실행. (server, base_url) 반환"""
+    server = make_server(**kwargs)
+    threading.Thread(target=server.serve_forever, name="news-stub", daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HackerNews/OpenAI 스텁 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixture", help="record_news_fixture.py 로 녹화한 JSON (없으면 합성 데이터)")
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    server = make_server(
+        host=args.host,
+        port=args.port,
+        fixture=load_fixture(args.fixture),
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    print(f"[OK] stub server on http://{args.host}:{args.port} (HN: /v0, OpenAI: /v1, stats: /__stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
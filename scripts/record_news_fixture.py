@@ -0,0 +1,64 @@
+"""
+실제 HackerNews(와 선택적으로 OpenAI) 응답을 한 번 녹화해 스텁 서버용 JSON으로 저장한다.
+
+    python3 scripts/record_news_fixture.py --output data/news_replay.json --with-completions
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+from app.services import http_client, news
+
+
+def record(limit, with_completions, completion_limit):
+    top_story_ids = http_client.get(news.HN_TOP_STORIES_URL).json()[:limit]
+    items = {str(story_id): item for story_id, item in news._fetch_hn_items(top_story_ids, deadline=30)}
+    fixture = {
+        "recorded_at": time.time(),
+        "topstories": top_story_ids,
+        "items": items,
+        "completions": {},
+    }
+
+    if with_completions:
+        if not news.client:
+            print("[WARN] OPENAI_API_KEY 가 없어 GPT 응답은 녹화하지 않습니다")
+            return fixture
+        candidates = [
+            {**item, "source": "HackerNews"}
+            for item in items.values()
+            if item and "title" in item and "url" in item
+        ]
+        candidates.sort(
+            key=lambda item: news._calculate_relevance_score(item["title"], item.get("score", 0)),
+            reverse=True,
+        )
+        for item in candidates[:completion_limit]:
+            fixture["completions"][str(item["id"])], _finish_reason = news._chat_completion(
+                news._build_summary_messages(item), max_tokens=3000
+            )
+            print(f"[INFO] GPT 응답 녹화: {item['id']}")
+    return fixture
+
+
+def main():
+    parser = argparse.ArgumentParser(description="뉴스 파이프라인 응답 녹화")
+    parser.add_argument("--output", default=os.path.join(BASE_DIR, "data", "news_replay.json"))
+    parser.add_argument("--limit", type=int, default=50, help="녹화할 topstories 수")
+    parser.add_argument("--with-completions", action="store_true", help="상위 후보의 GPT 응답도 녹화 (유료)")
+    parser.add_argument("--completion-limit", type=int, default=5)
+    args = parser.parse_args()
+
+    fixture = record(args.limit, args.with_completions, args.completion_limit)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(fixture, file, ensure_ascii=False, indent=2)
+    print(f"[OK] {len(fixture['items'])} items, {len(fixture['completions'])} completions -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
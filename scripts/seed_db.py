@@ -1,70 +1,42 @@
-import json
+"""
+문제/영상 시드 데이터 적재. 여러 번 실행해도 안전하며 바뀐 행만 갱신한다.
+
+    python3 scripts/seed_db.py
+    python3 scripts/seed_db.py --questions big_bank.jsonl --batch-size 20000
+"""
+import argparse
 import os
 import sys
+import time
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 sys.path.insert(0, BASE_DIR)
 
-from app.db import get_db, init_db
-from app.main import create_app
+from app.db import connect
+from app.migrations import migrate
+from app.services import seeding
 
-BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 QUESTIONS_PATH = os.path.join(BASE_DIR, "data", "seed_questions.json")
 VIDEOS_PATH = os.path.join(BASE_DIR, "data", "seed_videos.json")
 
 
-def load_json(path):
-    with open(path, "r", encoding="utf-8") as file:
-        return json.load(file)
-
-
-def seed_questions(db):
-    count = db.execute("SELECT COUNT(*) AS count FROM questions").fetchone()["count"]
-    if count > 0:
-        return
-
-    questions = load_json(QUESTIONS_PATH)
-    for q in questions:
-        db.execute(
-            """
-            INSERT INTO questions (topic, question, choice_a, choice_b, choice_c, choice_d, correct, concept_tag, difficulty)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                q["topic"],
-                q["question"],
-                q["choice_a"],
-                q["choice_b"],
-                q["choice_c"],
-                q["choice_d"],
-                q["correct"],
-                q["concept_tag"],
-                q.get("difficulty", "medium"),
-            ),
-        )
-
-
-def seed_videos(db):
-    count = db.execute("SELECT COUNT(*) AS count FROM concept_videos").fetchone()["count"]
-    if count > 0:
-        return
-
-    videos = load_json(VIDEOS_PATH)
-    for v in videos:
-        db.execute(
-            "INSERT INTO concept_videos (concept_tag, youtube_url) VALUES (?, ?)",
-            (v["concept_tag"], v["youtube_url"]),
-        )
-
-
 def main():
-    app = create_app()
-    with app.app_context():
-        init_db()
-        db = get_db()
-        seed_questions(db)
-        seed_videos(db)
-        db.commit()
+    parser = argparse.ArgumentParser(description="문제/영상 시드 데이터 적재 (JSON 배열 또는 JSON Lines)")
+    parser.add_argument("--questions", default=QUESTIONS_PATH, help="문제 파일 (빈 문자열이면 건너뜀)")
+    parser.add_argument("--videos", default=VIDEOS_PATH, help="영상 파일 (빈 문자열이면 건너뜀)")
+    parser.add_argument("--batch-size", type=int, default=seeding.DEFAULT_BATCH_SIZE, help="트랜잭션당 행 수")
+    args = parser.parse_args()
+
+    db = connect()
+    migrate(db)
+    with seeding.bulk_load(db):
+        if args.questions:
+            started = time.perf_counter()
+            seeding.report("questions", seeding.seed_questions(db, args.questions, args.batch_size), started)
+        if args.videos:
+            started = time.perf_counter()
+            seeding.report("concept_videos", seeding.seed_videos(db, args.videos, args.batch_size), started)
+    db.close()
 
 
 if __name__ == "__main__":
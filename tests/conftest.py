@@ -0,0 +1,31 @@
+import os
+import sys
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from app import db as app_db
+from app.main import create_app
+from app.services import question_bank, seeding
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """임시 DB 에 시드 문제/영상을 넣은 앱"""
+    monkeypatch.setattr(app_db, "DB_PATH", str(tmp_path / "test.db"))
+    app = create_app()
+    with app.app_context():
+        db = app_db.get_thread_db()
+        seeding.seed_questions(db, os.path.join(BASE_DIR, "data", "seed_questions.json"))
+        seeding.seed_videos(db, os.path.join(BASE_DIR, "data", "seed_videos.json"))
+    question_bank.invalidate()
+    yield app
+    question_bank.invalidate()
+    app_db.release_thread_db()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
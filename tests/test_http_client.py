@@ -0,0 +1,58 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services import http_client
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    peers = set()
+    lock = threading.Lock()
+
+    def log_message(self, *_args):
+        pass
+
+    def do_GET(self):
+        with self.lock:
+            self.peers.add(self.client_address[1])
+        time.sleep(0.02)
+        status = int(self.path.rsplit("/", 1)[-1])
+        body = b"{}"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(http_client, "POOL_MAXSIZE", 4)
+    monkeypatch.setattr(http_client, "_session", None)
+    http_client.reset_stats()
+    _Handler.peers = set()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    http_client.get_session().close()
+    http_client.reset_stats()
+
+
+def test_connections_per_host_are_capped(server):
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(lambda _i: http_client.get(f"{server}/200"), range(48)))
+    # 풀이 다 차도 커넥션을 더 열지 않고 반납을 기다린다
+    assert len(_Handler.peers) <= http_client.POOL_MAXSIZE
+
+
+def test_4xx_is_counted_separately(server):
+    for status in (200, 429, 403):
+        http_client.get(f"{server}/{status}")
+    stat = http_client.get_stats()["127.0.0.1"]
+    assert stat["requests"] == 3
+    assert stat["client_errors"] == 2
+    assert stat["errors"] == 0
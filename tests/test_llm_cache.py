@@ -0,0 +1,30 @@
+from app import db as app_db
+from app.services import llm_cache
+
+
+def _other_connection():
+    return app_db.connect(app_db.DB_PATH)
+
+
+def test_cache_write_commits_on_its_own(app):
+    llm_cache.store_completion("hn", 1, "제목", "v1", "요약")
+
+    other = _other_connection()
+    assert other.execute("SELECT content FROM news_llm_cache").fetchone()["content"] == "요약"
+    other.close()
+
+
+def test_cache_write_leaves_the_callers_transaction_open(app):
+    db = app_db.get_thread_db()
+    db.execute("UPDATE questions SET topic = 'changed' WHERE id = 1")
+
+    llm_cache.store_completion("hn", 1, "제목", "v1", "요약")
+    llm_cache.evict()
+
+    # 요청 쪽 미완료 변경은 캐시 쓰기와 함께 커밋되지도, 롤백되지도 않는다
+    assert db.in_transaction
+    assert db.execute("SELECT topic FROM questions WHERE id = 1").fetchone()["topic"] == "changed"
+    other = _other_connection()
+    assert other.execute("SELECT topic FROM questions WHERE id = 1").fetchone()["topic"] != "changed"
+    other.close()
+    db.rollback()
@@ -0,0 +1,48 @@
+from app.services import sampling
+
+
+def _start(client, **overrides):
+    payload = {"nickname": "tester", "topic": "all", "difficulty": "easy", **overrides}
+    return client.post("/quiz/api/start", json=payload)
+
+
+def test_start_hides_answers(client):
+    response = _start(client)
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["total"] == len(body["questions"]) > 0
+    for question in body["questions"]:
+        assert "correct" not in question and "concept_tag" not in question
+        assert [choice["key"] for choice in question["choices"]] == ["A", "B", "C", "D"]
+
+
+def test_submit_scores_and_clears_session(client):
+    body = _start(client).get_json()
+    response = client.post("/quiz/api/submit", json={"answers": ["A"] * body["total"]})
+    assert response.status_code == 200
+    result = response.get_json()
+    assert result["total"] == body["total"]
+    assert 0 <= result["score"] <= result["total"]
+    assert client.post("/quiz/api/submit", json={"answers": []}).status_code == 409
+
+
+def test_submit_rejects_wrong_answer_count(client):
+    body = _start(client).get_json()
+    response = client.post("/quiz/api/submit", json={"answers": ["A"] * (body["total"] + 1)})
+    assert response.status_code == 400
+
+
+def test_missing_question_is_dropped_from_session(client, monkeypatch):
+    """뽑은 뒤 지워진 문제가 있어도 내려준 문제 수만큼 답하면 제출된다"""
+    original = sampling.sample_questions
+
+    def sample_with_deleted(db, topic, difficulty):
+        return original(db, topic, difficulty) + [10 ** 9]
+
+    monkeypatch.setattr(sampling, "sample_questions", sample_with_deleted)
+    body = _start(client).get_json()
+    assert 10 ** 9 not in [question["id"] for question in body["questions"]]
+
+    response = client.post("/quiz/api/submit", json={"answers": ["A"] * body["total"]})
+    assert response.status_code == 200
+    assert response.get_json()["total"] == body["total"]
@@ -0,0 +1,40 @@
+from app import db as app_db
+from app.services import results, rollups
+
+
+def _record(db, user_id, tag_misses, created_at, difficulty="easy"):
+    weak_tags = sorted(tag_misses, key=tag_misses.get, reverse=True)[:3]
+    results.record_result(
+        db, user_id, f"user{user_id}", 10 - sum(tag_misses.values()), weak_tags, tag_misses,
+        30, difficulty, created_at,
+    )
+
+
+def test_tag_misses_count_every_wrong_answer(app):
+    db = app_db.get_thread_db()
+    _record(db, 1, {"DB": 5, "OS": 1, "HTTP": 1, "Git": 1}, "2026-01-01 10:00")
+    _record(db, 2, {"DB": 1}, "2026-01-01 11:00")
+    db.commit()
+
+    assert rollups.update_rollups(db) == 2
+    misses = {row["concept_tag"]: row["misses"] for row in rollups.top_missed_tags(db, "2026-01-01")}
+    # 상위 3개에 못 든 Git 도, 한 번에 5문제 틀린 DB 도 그대로 센다
+    assert misses == {"DB": 6, "OS": 1, "HTTP": 1, "Git": 1}
+
+
+def test_archive_moves_rows_into_compressed_blocks(app):
+    db = app_db.get_thread_db()
+    for user_id in range(1, 51):
+        _record(db, user_id, {"DB": user_id % 3}, f"2026-01-0{1 + user_id % 2} 10:00")
+    _record(db, 99, {"OS": 1}, "2026-03-01 10:00")
+    db.commit()
+
+    assert rollups.archive_attempts(db, "2026-02-01") == 50
+    assert db.execute("SELECT COUNT(*) FROM attempts").fetchone()[0] == 1
+    assert db.execute("SELECT COUNT(*) FROM attempts_archive_blocks").fetchone()[0] == 2
+
+    archived = list(rollups.iter_archived_attempts(db, "2026-01-01", "2026-02-01"))
+    assert sorted(row["user_id"] for row in archived) == list(range(1, 51))
+    assert all(row["tag_misses"] == {"DB": row["user_id"] % 3} for row in archived)
+    # 보관된 행은 다시 집계되지 않는다
+    assert rollups.update_rollups(db) == 0
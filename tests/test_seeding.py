@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from app import db as app_db
+from app.services import seeding
+
+
+def _question(text, difficulty, **extra):
+    record = {
+        "topic": "DB", "question": text, "choice_a": "a", "choice_b": "b", "choice_c": "c",
+        "choice_d": "d", "correct": "A", "concept_tag": "DB-Index", "difficulty": difficulty,
+    }
+    record.update(extra)
+    return record
+
+
+def test_same_text_at_other_difficulty_is_a_separate_question(app, tmp_path):
+    path = tmp_path / "bank.jsonl"
+    path.write_text("\n".join(json.dumps(_question("같은 본문", level)) for level in ("easy", "hard")))
+    db = app_db.get_thread_db()
+
+    assert seeding.seed_questions(db, str(path))["inserted"] == 2
+    assert seeding.seed_questions(db, str(path)) == {"inserted": 0, "updated": 0, "unchanged": 2}
+
+
+@pytest.mark.parametrize("body, message", [
+    ('[{"a": 1} {"a": 2}]', "',' 가 없습니다"),
+    ('[{"a": 1},, {"a": 2}]', "두 번 이상"),
+    ('[1]', "JSON 객체가 아닙니다"),
+    ('[{"a": 1},]', "레코드가 없습니다"),
+    ('[{"a": 1}', "']' 로 끝나지 않았습니다"),
+])
+def test_malformed_json_array_is_rejected(tmp_path, body, message):
+    path = tmp_path / "bank.json"
+    path.write_text(body)
+    with pytest.raises(ValueError, match=message):
+        list(seeding.iter_records(str(path)))
+
+
+def test_json_array_reads_across_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(seeding, "_READ_CHUNK", 7)
+    path = tmp_path / "bank.json"
+    path.write_text('[ {"q": "a]b"} ,\n {"q": "c"} ]')
+    assert list(seeding.iter_records(str(path))) == [{"q": "a]b"}, {"q": "c"}]
@@ -0,0 +1,48 @@
+import datetime
+
+import pytest
+from flask import session
+
+from app import sessions
+
+
+@pytest.fixture(params=[sessions.MemorySessionStore, sessions.SqliteSessionStore])
+def server_app(app, request):
+    app.session_interface = sessions.ServerSideSessionInterface(request.param())
+
+    @app.post("/_test/session/<action>")
+    def _session_action(action):
+        if action == "start":
+            session["answers"] = [1]
+        elif action == "append":
+            session["answers"].append(2)  # 중첩 리스트만 바꾸고 modified 는 세우지 않는다
+        elif action == "when":
+            session["when"] = datetime.date(2026, 1, 2)
+        elif action == "broken":
+            session["broken"] = {(1, 2): "튜플 키"}
+        return {"answers": session.get("answers"), "when": session.get("when")}
+
+    return app
+
+
+def test_nested_values_are_not_shared_between_requests(server_app):
+    client = server_app.test_client()
+    client.post("/_test/session/start")
+    client.post("/_test/session/append")
+
+    # 저장되지 않은 변경이 저장소 안의 값을 바꾸면 안 된다
+    assert client.post("/_test/session/noop").get_json()["answers"] == [1]
+
+
+def test_non_json_values_are_converted(server_app):
+    client = server_app.test_client()
+    client.post("/_test/session/when")
+    assert client.post("/_test/session/noop").get_json()["when"] == "2026-01-02"
+
+
+def test_unencodable_session_does_not_fail_the_request(server_app):
+    client = server_app.test_client()
+    client.post("/_test/session/start")
+    assert client.post("/_test/session/broken").status_code == 200
+    assert client.post("/_test/session/noop").get_json()["answers"] == [1]
+